@@ -1,8 +1,28 @@
 # config/config_manager.py
-import json
+import copy
+import mmap
 import os
 import logging
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional, fall back to stdlib json
+    import json
+
+    def _loads(data: bytes) -> Any:
+        return json.loads(bytes(data))
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
 
 class ConfigManager:
     """
@@ -32,6 +52,12 @@ class ConfigManager:
         }
     }
     
+    # Serialized defaults; parsing this gives a fresh deep copy in one call
+    _DEFAULT_BLOB = _dumps(DEFAULT_CONFIG)
+    
+    # Parsed configs keyed by absolute file path: (mtime, config)
+    _cache: Dict[str, Tuple[float, Dict]] = {}
+    
     def __init__(self, config_file: str = 'config.json'):
         """
         Initialize the configuration manager.
@@ -40,8 +66,13 @@ class ConfigManager:
             config_file: Path to the configuration file
         """
         self.config_file = config_file
+        self._config_path = os.path.abspath(config_file)
+        self._config_dir = os.path.dirname(self._config_path)
+        self._last_written_hash: Optional[int] = None
         self.logger = logging.getLogger('midi_calculator.config')
-        self.config = self.DEFAULT_CONFIG.copy()
+        self._config = _loads(self._DEFAULT_BLOB)
+        self._flat: Dict[Tuple[str, str], Any] = {}
+        self._rebuild_flat()
         self.load_config()
     
     def load_config(self) -> bool:
@@ -53,11 +84,22 @@ class ConfigManager:
         """
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
+                key = self._config_path
+                mtime = os.stat(key).st_mtime
+                
+                # Reuse the parsed config if the file hasn't changed on disk
+                cached = ConfigManager._cache.get(key)
+                if cached is not None and cached[0] == mtime:
+                    self._config = copy.deepcopy(cached[1])
+                    self._rebuild_flat()
+                    return True
+                
+                loaded_config = self._read_config_file()
                 
                 # Merge loaded config with defaults (preserving defaults for missing values)
-                self._merge_configs(self.config, loaded_config)
+                self._merge_configs(self._config, loaded_config)
+                self._rebuild_flat()
+                ConfigManager._cache[key] = (mtime, copy.deepcopy(self._config))
                 self.logger.info(f"Loaded configuration from {self.config_file}")
                 return True
             else:
@@ -68,6 +110,32 @@ class ConfigManager:
             self.logger.error(f"Error loading config: {str(e)}")
             return False
     
+    def _read_config_file(self) -> Dict:
+        """
+        Map the configuration file into memory and parse it in a single pass.
+        
+        Returns:
+            Dict: Parsed configuration (empty if the file is empty)
+        """
+        fd = os.open(self.config_file, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return {}
+            
+            # flags/prot are POSIX-only; elsewhere use the portable access mode.
+            # Prefault the pages where supported so the parse doesn't page-fault
+            if hasattr(mmap, 'MAP_POPULATE'):
+                mm = mmap.mmap(fd, size, flags=mmap.MAP_PRIVATE | mmap.MAP_POPULATE,
+                               prot=mmap.PROT_READ)
+            else:
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            with mm:
+                with memoryview(mm) as view:
+                    return _loads(view)
+        finally:
+            os.close(fd)
+    
     def save_config(self) -> bool:
         """
         Save current configuration to file.
@@ -76,11 +144,26 @@ class ConfigManager:
             bool: True if configuration was saved successfully, False otherwise
         """
         try:
+            blob = _dumps(self._config)
+            blob_hash = hash(blob)
+            
+            # Nothing changed since the last write
+            if blob_hash == self._last_written_hash:
+                return True
+            
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(self.config_file)), exist_ok=True)
+            os.makedirs(self._config_dir, exist_ok=True)
             
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Write to a temporary file and swap it in so readers never see a torn file
+            tmp_path = self._config_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, self._config_path)
+            self._last_written_hash = blob_hash
+            
+            # Keep the cache in step with what was just written
+            key = self._config_path
+            ConfigManager._cache[key] = (os.stat(key).st_mtime, copy.deepcopy(self._config))
             
             self.logger.info(f"Saved configuration to {self.config_file}")
             return True
@@ -100,10 +183,7 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        try:
-            return self.config[section][key]
-        except KeyError:
-            return default
+        return self._flat.get((section, key), default)
     
     def set(self, section: str, key: str, value: Any) -> bool:
         """
@@ -118,27 +198,52 @@ class ConfigManager:
             bool: True if value was set successfully, False otherwise
         """
         try:
-            if section not in self.config:
-                self.config[section] = {}
+            if section not in self._config:
+                self._config[section] = {}
+                self._rebuild_flat()
             
-            self.config[section][key] = value
+            self._config[section][key] = value
+            self._flat[(section, key)] = value
             return True
         except Exception as e:
             self.logger.error(f"Error setting config value: {str(e)}")
             return False
     
+    @property
+    def config(self) -> MappingProxyType:
+        """Read-only view of the configuration; change values through set() so get() stays current"""
+        return self._config_view
+    
+    def _rebuild_flat(self) -> None:
+        """Rebuild the flat (section, key) -> value lookup used by get() and the config view"""
+        self._config_view = MappingProxyType({
+            section: MappingProxyType(values) if isinstance(values, dict) else values
+            for section, values in self._config.items()
+        })
+        self._flat = {
+            (section, key): value
+            for section, values in self._config.items() if isinstance(values, dict)
+            for key, value in values.items()
+        }
+    
     def _merge_configs(self, target: Dict, source: Dict) -> None:
         """
-        Recursively merge source dictionary into target dictionary.
+        Merge source dictionary into target dictionary, descending into
+        nested dictionaries.
         
         Args:
             target: Target dictionary to merge into
             source: Source dictionary to merge from
         """
-        for key, value in source.items():
-            if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-                # Recursively merge nested dictionaries
-                self._merge_configs(target[key], value)
-            else:
-                # Otherwise just update the value
-                target[key] = value
+        # Iterative walk with an explicit stack of (target, source) pairs
+        stack = [(target, source)]
+        while stack:
+            t, s = stack.pop()
+            for key, value in s.items():
+                target_value = t.get(key)
+                if isinstance(target_value, dict) and isinstance(value, dict):
+                    # Merge nested dictionaries on a later pass
+                    stack.append((target_value, value))
+                else:
+                    # Otherwise just update the value
+                    t[key] = value
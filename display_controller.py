@@ -1,103 +1,232 @@
-import RPi.GPIO as GPIO
-from RPLCD import CharLCD
-import keyboard
+import pigpio
+from RPLCD.pigpio import CharLCD
+import os
+import select
+import sys
+import termios
+import threading
 import time
-import mido
+import traceback
+import tty
+from collections import deque
+from functools import lru_cache
+from itertools import chain
 from midi.scales import MidiScale
 
+try:
+    import evdev
+    from evdev import ecodes
+except ImportError:
+    # evdev is optional, fall back to reading keys from the terminal
+    evdev = None
+
+# Terminal input sequences mapped to key names
+_ESCAPE_KEYS = {
+    '\x1b[A': 'up',
+    '\x1b[B': 'down',
+    '\x1b[C': 'right',
+    '\x1b[D': 'left',
+}
+_CONTROL_KEYS = {
+    '\r': 'enter',
+    '\n': 'enter',
+    '\x7f': 'backspace',
+    '\x08': 'backspace',
+}
+
+# Key codes from a grabbed evdev keyboard mapped to the same key names
+if evdev is not None:
+    _EVDEV_KEYS = {
+        ecodes.KEY_COMMA: ',',
+        ecodes.KEY_DOT: '.',
+        ecodes.KEY_KPDOT: '.',
+        ecodes.KEY_LEFT: 'left',
+        ecodes.KEY_RIGHT: 'right',
+        ecodes.KEY_UP: 'up',
+        ecodes.KEY_DOWN: 'down',
+        ecodes.KEY_LEFTBRACE: '[',
+        ecodes.KEY_RIGHTBRACE: ']',
+        ecodes.KEY_ENTER: 'enter',
+        ecodes.KEY_KPENTER: 'enter',
+        ecodes.KEY_BACKSPACE: 'backspace',
+        ecodes.KEY_Q: 'q',
+        ecodes.KEY_W: 'w',
+    }
+    for _digit in '0123456789':
+        _EVDEV_KEYS[getattr(ecodes, 'KEY_' + _digit)] = _digit
+        _EVDEV_KEYS[getattr(ecodes, 'KEY_KP' + _digit)] = _digit
+
+# Clock for every refresh/error deadline; immune to wall-clock steps
+_now = time.monotonic
+
+# HD44780 "set DDRAM address" command
+_LCD_SETDDRAMADDR = 0x80
+
+# Navigation keys that can be folded into one move when pressed in a burst
+_NAV_KEYS = {
+    ',': ('page', -1),
+    '.': ('page', 1),
+    'left': ('param', -1),
+    'right': ('param', 1),
+    'up': ('param', -1),
+    'down': ('param', 1),
+}
+
+# Row label prefixes for the MIDI and NOTE pages (selected / unselected)
+_CH_SEL, _CH_UNSEL = "*CH:", " CH:"
+_PORT_SEL, _PORT_UNSEL = "*Port:", " Port:"
+_NOTE_SEL, _NOTE_UNSEL = "*Note:", " Note:"
+_DUR_SEL, _DUR_UNSEL = "*Dur:", " Dur:"
+
+# Pages whose parameter list scrolls instead of wrapping
+_SCROLLING_PAGES = frozenset({'TIME', 'SCALE'})
+_SCALE_CHOICE_PARAMS = frozenset({'root', 'type'})
+_OCTAVE_PARAMS = frozenset({'start_oct', 'end_oct'})
+
+
+def _parse_int(value):
+    """Parse a whole number, returning None instead of raising on bad input"""
+    if isinstance(value, int):
+        return value
+    digits = value[1:] if value[:1] == '-' else value
+    if not digits.isdecimal():
+        return None
+    return int(value)
+
+
+def _parse_float(value):
+    """Parse a non-negative decimal number, returning None on bad input"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value.replace('.', '', 1).isdecimal():
+        return None
+    return float(value)
+
+
+@lru_cache(maxsize=32)
+def _cached_flat_scale(root, type_, start_oct, end_oct):
+    """All notes of a scale as one tuple, lowest octave first"""
+    return tuple(chain.from_iterable(MidiScale.generate_scale(root, type_, start_oct, end_oct).values()))
+
+
+# Input validators, each returning (is_valid, parsed_value)
+@lru_cache(maxsize=128)
+def validate_channel(value):
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return 0 <= val <= 15, val
+
+
+@lru_cache(maxsize=128)
+def validate_note(value):
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return 0 <= val <= 127, val
+
+
+@lru_cache(maxsize=128)
+def validate_duration(value):
+    val = _parse_float(value)
+    if val is None:
+        return False, None
+    return val > 0, val
+
+
+@lru_cache(maxsize=128)
+def validate_port_index(value, max_ports):
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return 0 <= val < max_ports, val
+
+
+def validate_scale_root(value, valid_notes):
+    """Validates if a note is a valid root note"""
+    return value in valid_notes, value
+
+
+def validate_scale_type(value, valid_types):
+    """Validates if scale type is supported"""
+    return value in valid_types, value
+
 
-class InputValidator:
-    @staticmethod
-    def validate_channel(value):
-        try:
-            val = int(value)
-            return 0 <= val <= 15, val
-        except ValueError:
-            return False, None
+@lru_cache(maxsize=128)
+def validate_octave(value):
+    """Validates octave is within MIDI range"""
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return -2 <= val <= 8, val
 
-    @staticmethod
-    def validate_note(value):
-        try:
-            val = int(value)
-            return 0 <= val <= 127, val
-        except ValueError:
-            return False, None
 
-    @staticmethod
-    def validate_duration(value):
-        try:
-            val = float(value)
-            return val > 0, val
-        except ValueError:
-            return False, None
+def validate_boolean(value):
+    """Validates boolean value"""
+    return isinstance(value, bool), value
 
-    @staticmethod
-    def validate_port_index(value, max_ports):
-        try:
-            val = int(value)
-            return 0 <= val < max_ports, val
-        except ValueError:
-            return False, None
-
-    @staticmethod
-    def validate_scale_root(value, valid_notes):
-        """Validates if a note is a valid root note"""
-        return value in valid_notes, value
-
-    @staticmethod
-    def validate_scale_type(value, valid_types):
-        """Validates if scale type is supported"""
-        return value in valid_types, value
-
-    @staticmethod
-    def validate_octave(value):
-        """Validates octave is within MIDI range"""
-        try:
-            val = int(value)
-            return -2 <= val <= 8, val
-        except ValueError:
-            return False, None
-
-    @staticmethod
-    def validate_boolean(value):
-        """Validates boolean value"""
-        return value in [True, False], value
-
-    @staticmethod
-    def validate_bpm(value):
-        try:
-            val = int(value)
-            return 20 <= val <= 300, val
-        except ValueError:
-            return False, None
 
-    @staticmethod
-    def validate_pattern_length(value, max_steps):
-        try:
-            val = int(value)
-            return 1 <= val <= max_steps, val
-        except ValueError:
-            return False, None
+@lru_cache(maxsize=128)
+def validate_bpm(value):
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return 20 <= val <= 300, val
+
+
+@lru_cache(maxsize=128)
+def validate_pattern_length(value, max_steps):
+    val = _parse_int(value)
+    if val is None:
+        return False, None
+    return 1 <= val <= max_steps, val
+
+
+class PigpioCharLCD(CharLCD):
+    """
+    RPLCD's pigpio LCD with a positioned write. Each byte already goes to the
+    pins through RPLCD's stored pigpiod script in one round trip, so the
+    nibble writes are left as they are.
+    """
+
+    def write_at(self, row, col, text):
+        """
+        Write text starting at (row, col) with a single DDRAM address command,
+        skipping write_string's per-character line-wrap bookkeeping. The text
+        must fit on the row.
+        """
+        # Same row start addresses RPLCD's cursor_pos setter uses
+        row_offset = (0x00, 0x40, self.lcd.cols, 0x40 + self.lcd.cols)[row]
+        self.command(_LCD_SETDDRAMADDR | (row_offset + col))
+        data = self.codec.encode(text)
+        for byte in data:
+            self._send_data(byte)
+        self._cursor_pos = (row, col + len(data))
 
 
 class DisplayError:
-    def __init__(self, lcd):
+    def __init__(self, lcd, on_change=None):
         self.lcd = lcd
+        self.on_change = on_change  # Called after an error is shown
         self.error_displayed = False
         self.error_start_time = 0
+        self.error_deadline = 0
         self.error_display_duration = 0.5  # seconds
 
     def show_error(self, message):
-        self.lcd.clear()
+        # Pad both rows to the LCD width so no clear() is needed
         self.lcd.cursor_pos = (0, 0)
-        self.lcd.write_string("Error:")
+        self.lcd.write_string("Error:".ljust(16))
         self.lcd.cursor_pos = (1, 0)
-        self.lcd.write_string(message[:16])  # Truncate to LCD width
+        self.lcd.write_string(message[:16].ljust(16))  # Truncate to LCD width
         self.error_displayed = True
-        self.error_start_time = time.time()
+        self.error_start_time = _now()
+        self.error_deadline = self.error_start_time + self.error_display_duration
+        if self.on_change:
+            self.on_change()
 
     def clear_error(self):
-        if self.error_displayed and (time.time() - self.error_start_time) > self.error_display_duration:
+        if self.error_displayed and _now() >= self.error_deadline:
             self.error_displayed = False
             return True
         return False
@@ -105,20 +234,32 @@ class DisplayError:
 
 class DisplayController:
 
+    # Scale choices, computed once instead of on every edit/scroll
+    _scale_types = MidiScale.SCALE_TYPES
+    _scale_types_index = {t: i for i, t in enumerate(_scale_types)}
+    _valid_notes = MidiScale.NOTE_NAMES
+    _note_index = {n: i for i, n in enumerate(_valid_notes)}
+
     # Initialization and Setup
 
-    def __init__(self, midi_device, sequencer):
+    def __init__(self, midi_device, sequencer, keyboard_path=None):
         self.midi_device = midi_device
         self.sequencer = sequencer
+        # evdev device node for the controller's keyboard, e.g. /dev/input/event0
+        self.keyboard_path = keyboard_path
 
         # Define LCD dimensions as class variables
         self.lcd_width = 16
         self.lcd_height = 2
 
-        self.lcd = CharLCD(
+        # Pins are driven through the pigpio daemon (BCM numbering)
+        self._pi = pigpio.pi()
+        if not self._pi.connected:
+            raise RuntimeError("Cannot connect to pigpiod, is it running?")
+        self.lcd = PigpioCharLCD(
+            self._pi,
             pin_rs=25, pin_rw=24, pin_e=23,
             pins_data=[17, 18, 27, 22],
-            numbering_mode=GPIO.BCM,
             cols=self.lcd_width, rows=self.lcd_height
         )
         self.current_page = 0
@@ -139,13 +280,21 @@ class DisplayController:
 
         self.current_param_index = 0
         self.note_params = {'note': None, 'duration': 0.5}
+        self._refresh_note_labels()
         self.editing = False
-        self.edit_buffer = ""
+        self.edit_buffer = bytearray()  # Typed digits, decoded when drawn or saved
         self.current_port_idx = 0
-        self.validator = InputValidator()
-        self.error_handler = DisplayError(self.lcd)
-        self.last_update = time.time()
+        self.error_handler = DisplayError(self.lcd, on_change=self._request_update)
+        self.last_update = 0.0  # Nothing drawn yet
         self.update_interval = 0.1  # 100ms refresh rate
+        self.edit_update_interval = 0.016  # Faster floor while typing
+        self.redraw_delay = 0.02  # Coalesce input bursts into one redraw
+        self.input_debounce = 0.05  # Quiet time after typing/scrolling before redrawing
+        self._dirty = False
+        self._redraw_deadline = 0
+        # Key presses waiting for the UI thread, which also does every redraw
+        self._input_events = deque(maxlen=64)
+        self._ui_cond = threading.Condition()
 
         self.time_params = {
             'bpm': 120,
@@ -160,66 +309,334 @@ class DisplayController:
             'apply': False
         }
         self.param_scroll_offset = 0  # Track scrolling position for parameters
+        # Last text written to each LCD row (None = unknown, repaint whole row)
+        self._shadow = [' ' * self.lcd_width for _ in range(self.lcd_height)]
+
+        # Page renderers in page order, and parameter names for the scrolling pages
+        self._page_dispatch = (self.display_midi, self.display_note, self.display_time, self.display_scale)
+        # Parameter names and scrolling flag per page index, so hot paths skip the page-name lookups
+        self._param_table = tuple(tuple(self.params[page]) for page in self.pages)
+        self._page_scrolls = tuple(page in _SCROLLING_PAGES for page in self.pages)
+        # Parameters with preset choices, and the handler that steps through them
+        self._option_handlers = {
+            'port': self._scroll_port_options,
+            'root': self._scroll_note_options,
+            'type': self._scroll_scale_type_options,
+            'apply': self._scroll_boolean_option,
+        }
+        # Validate-and-store handler for each editable parameter
+        self._param_handlers = {
+            'channel': self._save_channel,
+            'port': self._save_port,
+            'note': self._save_note,
+            'duration': self._save_duration,
+            'bpm': self._save_bpm,
+            'pattern_length': self._save_pattern_length,
+            'root': self._save_root,
+            'type': self._save_type,
+            'start_oct': lambda value: self._save_octave('start_oct', value),
+            'end_oct': lambda value: self._save_octave('end_oct', value),
+            'apply': self._save_apply,
+        }
+        self._time_keys = tuple(self.time_params)
+        self._scale_keys = tuple(self.scale_params)
+        self._refresh_port_labels()
+
+        # Per-parameter row prefixes to try in order (full name, then abbreviation),
+        # as (" label:", "*label:") indexed by selection, each with the longest
+        # value that still fits after them
+        self._param_format = {}
+        for page_params in self.params.values():
+            for param in page_params:
+                labels = [param]
+                if param in self.param_abbreviations:
+                    labels.append(self.param_abbreviations[param])
+                self._param_format[param] = tuple(
+                    ((' ' + label + ':', '*' + label + ':'), self.lcd_width - 2 - len(label))
+                    for label in labels
+                )
         self.setup_keyboard()
 
-    def setup_keyboard(self):
-        # page nav
-        keyboard.on_press_key(',', lambda _: self.prev_page())  # "<"
-        keyboard.on_press_key('.', lambda _: self.next_page())  # ">"
-
-        # Parameter Navigation
-        keyboard.on_press_key('left', lambda _: self.prev_param())
-        keyboard.on_press_key('right', lambda _: self.next_param())
-        keyboard.on_press_key('up', lambda _: self.prev_param())
-        keyboard.on_press_key('down', lambda _: self.next_param())
+    def _refresh_port_labels(self):
+        """Cache the truncated port names shown on the MIDI page"""
+        outputs = self.midi_device.midi_outputs
+        self._port_labels_source = outputs
+        self._port_labels_8 = tuple(name[:8] for name in outputs)
+        self._port_labels_edit = tuple(name[:6] + " [<>]" for name in outputs)
 
-        # Option Scrolling (for lists of choices)
-        keyboard.on_press_key('[', lambda _: self.scroll_options('prev'))
-        keyboard.on_press_key(']', lambda _: self.scroll_options('next'))
-
-        # Edit Controls
-        keyboard.on_press_key('enter', lambda _: self.handle_enter())
-        keyboard.on_press_key('backspace', lambda _: self.handle_backspace())
-
-        # Playback Controls
-        keyboard.on_press_key('q', lambda _: self.start_scale_playback())
-        keyboard.on_press_key('w', lambda _: self.stop_scale_playback())
+    def _refresh_note_labels(self):
+        """Cache the note and duration text shown on the NOTE page"""
+        note = self.note_params['note']
+        self._note_str = str(note) if note else '---'
+        self._dur_str = str(self.note_params['duration'])
 
+    def setup_keyboard(self):
+        self._key_handlers = {
+            # page nav
+            ',': self.prev_page,  # "<"
+            '.': self.next_page,  # ">"
+
+            # Parameter Navigation
+            'left': self.prev_param,
+            'right': self.next_param,
+            'up': self.prev_param,
+            'down': self.next_param,
+
+            # Option Scrolling (for lists of choices)
+            '[': lambda: self.scroll_options('prev'),
+            ']': lambda: self.scroll_options('next'),
+
+            # Edit Controls
+            'enter': self.handle_enter,
+            'backspace': self.handle_backspace,
+
+            # Playback Controls
+            'q': self.start_scale_playback,
+            'w': self.stop_scale_playback,
+        }
         # number input
-        for key in '0123456789.':
-            keyboard.on_press_key(key, lambda e: self.handle_number(e.name))
+        self._numeric_keys = frozenset('0123456789.')
+
+        # One reader thread for all keys instead of a hook per key
+        self._stop_input = threading.Event()
+        self._input_device = None
+        if self.keyboard_path and evdev is not None:
+            # Grab a single keyboard so unrelated input devices never wake us
+            self._input_device = evdev.InputDevice(self.keyboard_path)
+            self._input_device.grab()
+            reader = self._read_device_keys
+        else:
+            # termios needs a terminal; under systemd or a pipe there is none to read
+            if not sys.stdin.isatty():
+                raise RuntimeError("Keyboard input needs a terminal on stdin, or a keyboard_path "
+                                   "to an evdev device")
+            self._input_fd = sys.stdin.fileno()
+            self._saved_tty = termios.tcgetattr(self._input_fd)
+            tty.setcbreak(self._input_fd)
+            reader = self._read_keys
+        self._input_thread = threading.Thread(target=reader, daemon=True)
+        self._input_thread.start()
+        self._ui_thread = threading.Thread(target=self._ui_loop, daemon=True)
+        self._ui_thread.start()
+
+    def _read_device_keys(self):
+        """Read key-down and auto-repeat events from the grabbed keyboard"""
+        try:
+            for event in self._input_device.read_loop():
+                if self._stop_input.is_set():
+                    break
+                if event.type == ecodes.EV_KEY and event.value:
+                    name = _EVDEV_KEYS.get(event.code)
+                    if name:
+                        self._on_key_event(name)
+        except OSError:
+            # The device was closed or unplugged
+            pass
+
+    def _read_keys(self):
+        """Read key presses from the terminal and dispatch them"""
+        while not self._stop_input.is_set():
+            ready, _, _ = select.select([self._input_fd], [], [], 0.5)
+            if not ready:
+                continue
+            chunk = os.read(self._input_fd, 32).decode(errors='ignore')
+            i = 0
+            while i < len(chunk):
+                if chunk.startswith('\x1b[', i):
+                    name = _ESCAPE_KEYS.get(chunk[i:i + 3])
+                    i += 3
+                else:
+                    name = _CONTROL_KEYS.get(chunk[i], chunk[i])
+                    i += 1
+                if name:
+                    self._on_key_event(name)
+
+    def _on_key_event(self, name):
+        """Single entry point for every key press; queues it for the UI thread"""
+        with self._ui_cond:
+            self._input_events.append(name)
+            self._ui_cond.notify()
+
+    def _apply_keys(self, names):
+        """Apply a batch of key presses, folding runs of page/param moves into one net move"""
+        i = 0
+        while i < len(names):
+            nav = self._nav_move(names[i])
+            if nav is None:
+                # One failing handler mustn't stop the thread every key goes through
+                try:
+                    self._apply_key(names[i])
+                except Exception:
+                    traceback.print_exc()
+                    self.error_handler.show_error("Key error")
+                i += 1
+                continue
+
+            kind, delta = nav
+            i += 1
+            while i < len(names):
+                nxt = self._nav_move(names[i])
+                if nxt is None or nxt[0] != kind:
+                    break
+                delta += nxt[1]
+                i += 1
+
+            if kind == 'page':
+                self._move_page(delta)
+            else:
+                self._move_param(delta)
+
+    def _nav_move(self, name):
+        # '.' types a decimal point while editing, so it can't be folded then
+        if self.editing and name in self._numeric_keys:
+            return None
+        return _NAV_KEYS.get(name)
+
+    def _move_page(self, delta):
+        if delta:
+            self.current_page = (self.current_page + delta) % len(self.pages)
+            self.current_param_index = 0
+            self.param_scroll_offset = 0
+            self._request_update()
+
+    def _move_param(self, delta):
+        # Only the net move within one lap matters; step so the scroll window follows
+        max_params = len(self._param_table[self.current_page])
+        if delta > 0:
+            for _ in range(delta % max_params):
+                self.next_param()
+        else:
+            for _ in range(-delta % max_params):
+                self.prev_param()
+
+    def _apply_key(self, name):
+        if name in self._numeric_keys:
+            self.handle_number(name)
+        handler = self._key_handlers.get(name)
+        if handler:
+            handler()
 
     def close(self):
+        self._stop_input.set()
+        with self._ui_cond:
+            # Don't let a pending redraw overwrite the goodbye message
+            self._dirty = False
+            self._ui_cond.notify()
+        self._ui_thread.join(timeout=1)
+        if self._input_device is not None:
+            self._input_device.ungrab()
+            self._input_device.close()
+        else:
+            termios.tcsetattr(self._input_fd, termios.TCSADRAIN, self._saved_tty)
         self.lcd.cursor_pos = (0, 0)
         self.lcd.write_string("Shutting down...")
         self.lcd.cursor_pos = (1, 0)
         self.lcd.write_string("Goodbye!")
         time.sleep(1)
-        self.lcd.clear()
-        self.lcd.close()
+        self.lcd.close(clear=True)
+        self._pi.stop()
+        # Ports opened while scrolling are left to MidiDevice.close()
 
     # Display State Management
-    def update_display(self):
+    def update_display(self, force=False):
+        if not force:
+            # Cap LCD traffic at the refresh rate; redraw once the interval is up
+            interval = self.edit_update_interval if self.editing else self.update_interval
+            wait = self.last_update + interval - _now()
+            if wait > 0:
+                self._request_update(wait)
+                return
+
+        # The error message is written straight to the LCD, so repaint fully after it
+        force_full = False
         if self.error_handler.error_displayed:
-            if self.error_handler.clear_error():
-                self.last_update = time.time()
-                self.lcd.clear()
-                self._update_current_page()
-        else:
-            self.last_update = time.time()
-            self.lcd.clear()
-            self._update_current_page()
-
-    def _update_current_page(self):
-        """Helper method to update the current page display"""
-        if self.pages[self.current_page] == 'MIDI':
-            self.display_midi()
-        elif self.pages[self.current_page] == 'NOTE':
-            self.display_note()
-        elif self.pages[self.current_page] == 'TIME':
-            self.display_time()
-        elif self.pages[self.current_page] == 'SCALE':
-            self.display_scale()
+            if not self.error_handler.clear_error():
+                # Come back when the error has been shown long enough
+                self._request_update(self.error_handler.error_deadline - _now())
+                return
+            force_full = True
+
+        self.last_update = _now()
+        self._flush_rows(self._render_current_page(), force_full)
+
+    def _request_update(self, delay=None):
+        """
+        Mark the display dirty and schedule a single coalesced redraw.
+
+        Args:
+            delay: Seconds to wait before redrawing; each call pushes the
+                redraw back to at least now + delay (defaults to redraw_delay)
+        """
+        if delay is None:
+            delay = self.redraw_delay
+        with self._ui_cond:
+            self._dirty = True
+            deadline = _now() + delay
+            if deadline > self._redraw_deadline:
+                self._redraw_deadline = deadline
+            self._ui_cond.notify()
+
+    def _ui_loop(self):
+        """Apply queued key presses and redraw when due, all on this one thread"""
+        while not self._stop_input.is_set():
+            with self._ui_cond:
+                while not self._input_events and not self._stop_input.is_set():
+                    timeout = None
+                    if self._dirty:
+                        timeout = self._redraw_deadline - _now()
+                        if timeout <= 0:
+                            break
+                    self._ui_cond.wait(timeout)
+                events = list(self._input_events)
+                self._input_events.clear()
+
+            self._apply_keys(events)
+
+            with self._ui_cond:
+                redraw = self._dirty and _now() >= self._redraw_deadline
+                if redraw:
+                    self._dirty = False
+            if redraw and not self._stop_input.is_set():
+                try:
+                    self.update_display()
+                except Exception:
+                    # Keep the loop alive; the next redraw repaints everything
+                    traceback.print_exc()
+                    self._shadow = [None] * self.lcd_height
+
+    def _current_param(self):
+        """Name of the selected parameter on the current page"""
+        return self._param_table[self.current_page][self.current_param_index]
+
+    def _render_current_page(self):
+        """Helper method to render the current page as a list of row strings"""
+        return self._page_dispatch[self.current_page]()
+
+    def _flush_rows(self, rows, force_full=False):
+        """
+        Write rows to the LCD with at most one address command and one data
+        burst per row, covering the span of characters that differ from what is
+        already on screen. With force_full, every row is rewritten whole.
+        """
+        width = self.lcd_width
+        for row in range(self.lcd_height):
+            text = rows[row] if row < len(rows) else ''
+            if len(text) != width:
+                text = text[:width].ljust(width)
+            old = None if force_full else self._shadow[row]
+
+            if old is None:
+                self.lcd.write_at(row, 0, text)
+            elif text != old:
+                start = 0
+                while text[start] == old[start]:
+                    start += 1
+                end = width
+                while text[end - 1] == old[end - 1]:
+                    end -= 1
+                self.lcd.write_at(row, start, text[start:end])
+
+            self._shadow[row] = text
 
     def format_parameter_text(self, param, value, selected=False, editing=False):
         """
@@ -234,21 +651,39 @@ class DisplayController:
         Returns:
             Formatted text string that fits within LCD width
         """
+        value_str = str(value)
+
+        # Fast path: a precomputed row prefix that fits the value as-is
+        formats = self._param_format.get(param)
+        if formats is not None:
+            value_len = len(value_str)
+            for labels, max_value_len in formats:
+                if value_len <= max_value_len:
+                    param_text = labels[selected] + value_str
+                    if editing and len(param_text) < self.lcd_width:
+                        param_text += "_"
+                    return param_text
+
         # Selection indicator
         prefix = '*' if selected else ' '
 
-        # Try full parameter name first
-        param_text = f"{prefix}{param}:{value}"
+        # Common case: the full name and value already fit
+        n = 2 + len(param) + len(value_str)
+        if n <= self.lcd_width:
+            param_text = prefix + param + ':' + value_str
+            if editing and n < self.lcd_width:
+                param_text += "_"
+            return param_text
 
-        # If it doesn't fit and we have an abbreviation, use that
-        if len(param_text) > self.lcd_width and param in self.param_abbreviations:
-            param_text = f"{prefix}{self.param_abbreviations[param]}:{value}"
+        # The full parameter name doesn't fit; use an abbreviation if we have one
+        param_text = f"{prefix}{param}:{value_str}"
+        if param in self.param_abbreviations:
+            param_text = f"{prefix}{self.param_abbreviations[param]}:{value_str}"
 
         ###### This solution is a little messy, for final product each truncation should be properly accounted for.
         # If still too long, use intelligent truncation
         if len(param_text) > self.lcd_width:
             # Calculate available space after prefix, colon and value
-            value_str = str(value)
             value_len = len(value_str)
 
             # Calculate maximum parameter name length
@@ -277,64 +712,59 @@ class DisplayController:
         return param_text[:self.lcd_width]  # Ensure it fits
 
     def display_midi(self):
-        self.lcd.cursor_pos = (0, 0)
-        channel_str = f"CH:{self.midi_device.channel}"
-        port_str = f"Port:{self.midi_device.midi_outputs[self.current_port_idx][:8]}"
+        width = self.lcd_width
+        channel = str(self.midi_device.channel)
+        # MidiDevice.rescan_ports() replaces the list; only then rebuild the labels
+        if self.midi_device.midi_outputs is not self._port_labels_source:
+            self._refresh_port_labels()
+        port = self._port_labels_8[self.current_port_idx]
 
         if self.current_param_index == 0:
             if self.editing:
-                channel_str = f"CH:{self.edit_buffer}"
-                if len(self.edit_buffer) < 3:
-                    channel_str += "_"
-            self.lcd.write_string(f"*{channel_str}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f" {port_str}")
+                channel = self.edit_buffer.decode()
+                if len(channel) < 3:
+                    channel += "_"
+            return (_CH_SEL + channel).ljust(width), (_PORT_UNSEL + port).ljust(width)
         else:  # Port parameter
             if self.editing:
-                port_str = f"Port:{self.midi_device.midi_outputs[self.current_port_idx][:6]} [<>]"
-            self.lcd.write_string(f" {channel_str}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f"*{port_str}")
+                port = self._port_labels_edit[self.current_port_idx]
+            return (_CH_UNSEL + channel).ljust(width), (_PORT_SEL + port).ljust(width)
 
     def display_note(self):
-        note = str(self.note_params['note']) if self.note_params['note'] else '---'
-        dur = str(self.note_params['duration'])
+        width = self.lcd_width
+        note = self._note_str
+        dur = self._dur_str
 
         if self.current_param_index == 0:  # Note parameter
             if self.editing:
-                note = self.edit_buffer
-                if len(self.edit_buffer) < 3:
+                note = self.edit_buffer.decode()
+                if len(note) < 3:
                     note += "_"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f"*Note:{note}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f" Dur:{dur}")
+            return (_NOTE_SEL + note).ljust(width), (_DUR_UNSEL + dur).ljust(width)
         else:  # Duration parameter
             if self.editing:
-                dur = self.edit_buffer
-                if len(self.edit_buffer) < 3:
+                dur = self.edit_buffer.decode()
+                if len(dur) < 3:
                     dur += "_"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f" Note:{note}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f"*Dur:{dur}")
+            return (_NOTE_UNSEL + note).ljust(width), (_DUR_SEL + dur).ljust(width)
 
     def display_time(self):
         """Display timing parameters with text formatting"""
         # Get the visible parameters based on the current scroll offset
-        time_params_keys = list(self.time_params.keys())
-        visible_params = time_params_keys[self.param_scroll_offset:self.param_scroll_offset + 2]
+        visible_params = self._time_keys[self.param_scroll_offset:self.param_scroll_offset + 2]
+        current = self._current_param()
+        rows = []
 
-        for i, param in enumerate(visible_params):
+        for param in visible_params:
             # Get the current value of the parameter
             value = str(self.time_params[param])
 
             # Determine if this parameter is selected
-            selected = param == self.params['TIME'][self.current_param_index]
+            selected = param == current
 
             # Handle editing mode
             if selected and self.editing:
-                display_value = self.edit_buffer
+                display_value = self.edit_buffer.decode()
             else:
                 display_value = value
 
@@ -346,32 +776,33 @@ class DisplayController:
                 editing=(selected and self.editing)
             )
 
-            # Set cursor position and display the text
-            self.lcd.cursor_pos = (i, 0)
-            self.lcd.write_string(param_text)
+            rows.append(param_text)
+
+        return rows
 
     def display_scale(self):
         """Display scale parameters with smart text formatting"""
         # Get the visible parameters based on the current scroll offset
-        scale_params_keys = list(self.scale_params.keys())
-        visible_params = scale_params_keys[self.param_scroll_offset:self.param_scroll_offset + 2]
+        visible_params = self._scale_keys[self.param_scroll_offset:self.param_scroll_offset + 2]
+        current = self._current_param()
+        rows = []
 
-        for i, param in enumerate(visible_params):
+        for param in visible_params:
             # Get the current value of the parameter
             value = str(self.scale_params[param])
 
             # Determine if this parameter is selected
-            selected = param == self.params['SCALE'][self.current_param_index]
+            selected = param == current
 
             # Handle editing mode
             if selected and self.editing:
-                if param in ['root', 'type']:
+                if param in _SCALE_CHOICE_PARAMS:
                     display_value = f"{value} [<>]"
                 elif param == 'apply':
                     # For 'apply' parameter, indicate it can be toggled using scrolling
                     display_value = f"{value} [<>]"
                 else:
-                    display_value = self.edit_buffer
+                    display_value = self.edit_buffer.decode()
             else:
                 display_value = value
 
@@ -383,9 +814,9 @@ class DisplayController:
                 editing=(selected and self.editing)
             )
 
-            # Set cursor position and display the text
-            self.lcd.cursor_pos = (i, 0)
-            self.lcd.write_string(param_text)
+            rows.append(param_text)
+
+        return rows
 
     def start_scale_playback(self):
         """Start the sequencer playback"""
@@ -411,28 +842,20 @@ class DisplayController:
 
     # Navigation
     def prev_page(self):
-        self.current_page = (self.current_page - 1) % len(self.pages)
-        self.current_param_index = 0
-        self.param_scroll_offset = 0
-        self.update_display()
-        self.update_display()
+        self._move_page(-1)
 
     def next_page(self):
-        self.current_page = (self.current_page + 1) % len(self.pages)
-        self.current_param_index = 0
-        self.param_scroll_offset = 0
-        self.update_display()
+        self._move_page(1)
 
     def prev_param(self):
-        page = self.pages[self.current_page]
-        max_params = len(self.params[page])
+        max_params = len(self._param_table[self.current_page])
 
         # Update selected parameter with wrap-around
         old_index = self.current_param_index
         self.current_param_index = (self.current_param_index - 1) % max_params
 
         # For pages with scrolling parameters
-        if page in ['TIME', 'SCALE']:
+        if self._page_scrolls[self.current_page]:
             # If we're moving up and already at top of visible window, scroll up
             if old_index == self.param_scroll_offset:
                 self.param_scroll_offset = (self.param_scroll_offset - 1) % max_params
@@ -440,18 +863,17 @@ class DisplayController:
                 if self.current_param_index == max_params - 1:
                     self.param_scroll_offset = max(0, max_params - 2)
 
-        self.update_display()
+        self._request_update()
 
     def next_param(self):
-        page = self.pages[self.current_page]
-        max_params = len(self.params[page])
+        max_params = len(self._param_table[self.current_page])
 
         # Update selected parameter with wrap-around
         old_index = self.current_param_index
         self.current_param_index = (self.current_param_index + 1) % max_params
 
         # For pages with scrolling parameters
-        if page in ['TIME', 'SCALE']:
+        if self._page_scrolls[self.current_page]:
             # If we're moving down and at bottom of visible window, scroll down
             if old_index == self.param_scroll_offset + 1:
                 self.param_scroll_offset = (self.param_scroll_offset + 1) % max_params
@@ -459,7 +881,7 @@ class DisplayController:
                 if self.current_param_index == 0:
                     self.param_scroll_offset = 0
 
-        self.update_display()
+        self._request_update()
 
     # Parameter editing
 
@@ -467,129 +889,133 @@ class DisplayController:
         self.editing = not self.editing
         if not self.editing:  # Exiting edit mode
             if self.edit_buffer:  # Only update if new input
-                self.save_param(self.edit_buffer)
-                self.edit_buffer = ""
+                self.save_param(self.edit_buffer.decode())
+                self.edit_buffer.clear()
             # Play note regardless if entering or exiting edit mode
-            if (self.pages[self.current_page] == 'NOTE' and
-                    self.params['NOTE'][self.current_param_index] == 'note' and
-                    self.note_params['note'] is not None):
+            if self._current_param() == 'note' and self.note_params['note'] is not None:
                 self.midi_device.send_note(
                     self.note_params['note'],
                     self.note_params['duration'],
                     self.midi_device.channel
                 )
-        self.update_display()
+        self._request_update()
 
     def save_param(self, value):
         if not value:
             return
 
-        page = self.pages[self.current_page]
-        param = self.params[page][self.current_param_index]
+        handler = self._param_handlers.get(self._current_param())
+        if handler is None:
+            return
 
         try:
-            if param == 'channel':
-                valid, val = self.validator.validate_channel(value)
-                if valid:
-                    self.midi_device.set_channel(val)
-                else:
-                    self.error_handler.show_error("Invalid channel")
+            handler(value)
+        except Exception as e:
+            self.error_handler.show_error("Input error")
 
-            elif param == 'port':
-                valid, val = self.validator.validate_port_index(value, len(self.midi_device.midi_outputs))
-                if valid:
-                    self.midi_device.outport.close()
-                    self.midi_device.outport = mido.open_output(self.midi_device.midi_outputs[val])
-                else:
-                    self.error_handler.show_error("Invalid port")
+    def _save_channel(self, value):
+        valid, val = validate_channel(value)
+        if valid:
+            self.midi_device.set_channel(val)
+        else:
+            self.error_handler.show_error("Invalid channel")
 
-            elif param == 'note':
-                valid, val = self.validator.validate_note(value)
-                if valid:
-                    self.note_params['note'] = val
-                else:
-                    self.error_handler.show_error("Invalid note")
+    def _save_port(self, value):
+        valid, val = validate_port_index(value, len(self.midi_device.midi_outputs))
+        if valid:
+            self.midi_device.open_port(self.midi_device.midi_outputs[val], keep_previous=True)
+        else:
+            self.error_handler.show_error("Invalid port")
 
-            elif param == 'duration':
-                valid, val = self.validator.validate_duration(value)
-                if valid:
-                    self.note_params['duration'] = val
-                else:
-                    self.error_handler.show_error("Invalid duration")
-
-            elif page == 'TIME':
-                if param == 'bpm':
-                    valid, val = self.validator.validate_bpm(value)
-                    if valid:
-                        self.time_params['bpm'] = val
-                        self.sequencer.set_bpm(val)
-                    else:
-                        self.error_handler.show_error("Invalid BPM")
-                elif param == 'pattern_length':
-                    valid, val = self.validator.validate_pattern_length(value, self.sequencer.max_steps)
-                    if valid:
-                        self.time_params['pattern_length'] = val
-                        self.sequencer.set_channel_steps(self.midi_device.channel, val)
-                    else:
-                        self.error_handler.show_error("Invalid length")
-
-            elif page == 'SCALE':
-                if param == 'root':
-                    valid_notes = list(MidiScale.NOTE_TO_MIDI.keys())
-                    valid, val = self.validator.validate_scale_root(value, valid_notes)
-                    if valid:
-                        self.scale_params['root'] = val
-                    else:
-                        self.error_handler.show_error("Invalid root")
-
-                elif param == 'type':
-                    valid_types = [attr.replace('_INTERVALS', '')
-                                   for attr in dir(MidiScale)
-                                   if attr.endswith('_INTERVALS')]
-                    valid, val = self.validator.validate_scale_type(value, valid_types)
-                    if valid:
-                        self.scale_params['type'] = val
-                    else:
-                        self.error_handler.show_error("Invalid type")
-
-                elif param in ['start_oct', 'end_oct']:
-                    valid, val = self.validator.validate_octave(value)
-                    if valid:
-                        if param == 'start_oct' and val > self.scale_params['end_oct']:
-                            self.error_handler.show_error("Start > End oct")
-                        elif param == 'end_oct' and val < self.scale_params['start_oct']:
-                            self.error_handler.show_error("End < Start oct")
-                        else:
-                            self.scale_params[param] = val
-                    else:
-                        self.error_handler.show_error("Invalid octave")
+    def _save_note(self, value):
+        valid, val = validate_note(value)
+        if valid:
+            self.note_params['note'] = val
+            self._refresh_note_labels()
+        else:
+            self.error_handler.show_error("Invalid note")
 
-                elif param == 'apply':
-                    self.scale_params['apply'] = not self.scale_params['apply']  # Toggle boolean
-
-                # Apply scale changes if all parameters are valid
-                if all(self.scale_params.values()):
-                    try:
-                        scale = MidiScale.generate_scale(
-                            self.scale_params['root'],
-                            self.scale_params['type'],
-                            self.scale_params['start_oct'],
-                            self.scale_params['end_oct']
-                        )
-
-                        if self.scale_params['apply']:
-                            # Flatten scale into single list of notes
-                            all_notes = [note for octave in scale.values() for note in octave]
-                            self.sequencer.apply_scale_to_pattern(all_notes)
-                    except Exception as e:
-                        self.error_handler.show_error("Scale error")
+    def _save_duration(self, value):
+        valid, val = validate_duration(value)
+        if valid:
+            self.note_params['duration'] = val
+            self._refresh_note_labels()
+        else:
+            self.error_handler.show_error("Invalid duration")
 
-        except Exception as e:
-            self.error_handler.show_error("Input error")
+    def _save_bpm(self, value):
+        valid, val = validate_bpm(value)
+        if valid:
+            self.time_params['bpm'] = val
+            self.sequencer.set_bpm(val)
+        else:
+            self.error_handler.show_error("Invalid BPM")
+
+    def _save_pattern_length(self, value):
+        valid, val = validate_pattern_length(value, self.sequencer.max_steps)
+        if valid:
+            self.time_params['pattern_length'] = val
+            self.sequencer.set_channel_steps(self.midi_device.channel, val)
+        else:
+            self.error_handler.show_error("Invalid length")
+
+    def _save_root(self, value):
+        valid, val = validate_scale_root(value, self._note_index)
+        if valid:
+            self._set_scale_param('root', val)
+        else:
+            self.error_handler.show_error("Invalid root")
+
+    def _save_type(self, value):
+        valid, val = validate_scale_type(value, self._scale_types_index)
+        if valid:
+            self._set_scale_param('type', val)
+        else:
+            self.error_handler.show_error("Invalid type")
+
+    def _save_octave(self, param, value):
+        valid, val = validate_octave(value)
+        if valid:
+            if param == 'start_oct' and val > self.scale_params['end_oct']:
+                self.error_handler.show_error("Start > End oct")
+            elif param == 'end_oct' and val < self.scale_params['start_oct']:
+                self.error_handler.show_error("End < Start oct")
+            else:
+                self._set_scale_param(param, val)
+        else:
+            self.error_handler.show_error("Invalid octave")
+
+    def _save_apply(self, value):
+        self.scale_params['apply'] = not self.scale_params['apply']  # Toggle boolean
+        if self.scale_params['apply']:
+            self._apply_scale()
+
+    def _set_scale_param(self, param, val):
+        # Only a real change to an applied scale needs the pattern rebuilt
+        if self.scale_params[param] != val:
+            self.scale_params[param] = val
+            if self.scale_params['apply']:
+                self._apply_scale()
+
+    def _apply_scale(self):
+        # Apply scale changes if all parameters are valid
+        if all(self.scale_params.values()):
+            try:
+                all_notes = _cached_flat_scale(
+                    self.scale_params['root'],
+                    self.scale_params['type'],
+                    self.scale_params['start_oct'],
+                    self.scale_params['end_oct']
+                )
+
+                if self.scale_params['apply']:
+                    self.sequencer.apply_scale_to_pattern(all_notes)
+            except Exception as e:
+                self.error_handler.show_error("Scale error")
 
     def update_param(self):
         self.toggle_edit()
-        self.update_display()
+        self._request_update()
 
     # Scrolling
     def scroll_options(self, direction):
@@ -603,39 +1029,25 @@ class DisplayController:
         if not self.editing:
             return
 
-        page = self.pages[self.current_page]
-        param = self.params[page][self.current_param_index]
-
-        # Define which parameters have scrollable options
-        option_handlers = {
-            'MIDI': {
-                'port': self._scroll_port_options,
-            },
-            'SCALE': {
-                'root': self._scroll_note_options,
-                'type': self._scroll_scale_type_options,
-                'apply': self._scroll_boolean_option,
-            }
-
-        }
-
         # Call appropriate scroll handler if it exists
-        if page in option_handlers and param in option_handlers[page]:
-            option_handlers[page][param](direction)
-            self.update_display()
+        handler = self._option_handlers.get(self._current_param())
+        if handler:
+            handler(direction)
+            self._request_update(self.input_debounce)
 
     def _scroll_port_options(self, direction):
         if direction == 'prev':
             self.current_port_idx = (self.current_port_idx - 1) % len(self.midi_device.midi_outputs)
         else:
             self.current_port_idx = (self.current_port_idx + 1) % len(self.midi_device.midi_outputs)
-        # Update MIDI port
-        self.midi_device.outport.close()
-        self.midi_device.outport = mido.open_output(self.midi_device.midi_outputs[self.current_port_idx])
+        # Update MIDI port, keeping the ports scrolled past open so switching
+        # back doesn't reopen them
+        self.midi_device.open_port(self.midi_device.midi_outputs[self.current_port_idx],
+                                   keep_previous=True)
 
     def _scroll_note_options(self, direction):
-        valid_notes = list(MidiScale.NOTE_TO_MIDI.keys())
-        current_idx = valid_notes.index(self.scale_params['root'])
+        valid_notes = self._valid_notes
+        current_idx = self._note_index[self.scale_params['root']]
         if direction == 'prev':
             new_idx = (current_idx - 1) % len(valid_notes)
         else:
@@ -643,10 +1055,8 @@ class DisplayController:
         self.scale_params['root'] = valid_notes[new_idx]
 
     def _scroll_scale_type_options(self, direction):
-        valid_types = [attr.replace('_INTERVALS', '')
-                       for attr in dir(MidiScale)
-                       if attr.endswith('_INTERVALS')]
-        current_idx = valid_types.index(self.scale_params['type'])
+        valid_types = self._scale_types
+        current_idx = self._scale_types_index[self.scale_params['type']]
         if direction == 'prev':
             new_idx = (current_idx - 1) % len(valid_types)
         else:
@@ -667,20 +1077,17 @@ class DisplayController:
 
     def handle_number(self, key):
         if self.editing:
-            page = self.pages[self.current_page]
-            param = self.params[page][self.current_param_index]
-
-            if key == '.' and '.' not in self.edit_buffer:
-                self.edit_buffer += key
+            if key == '.' and b'.' not in self.edit_buffer:
+                self.edit_buffer.extend(key.encode())
             elif key.isdigit() and len(self.edit_buffer) < 4:
-                self.edit_buffer += key
+                self.edit_buffer.extend(key.encode())
 
-            self.update_display()
+            self._request_update(self.input_debounce)
 
     def handle_backspace(self):
         if self.editing and self.edit_buffer:
-            self.edit_buffer = self.edit_buffer[:-1]
-            self.update_display()
+            del self.edit_buffer[-1:]
+            self._request_update(self.input_debounce)
 
 
 
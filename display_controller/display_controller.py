@@ -1,8 +1,8 @@
 # display_controller/display_controller.py
-from RPLCD import CharLCD
+from RPLCD.gpio import CharLCD
 import RPi.GPIO as GPIO
 import time
-import mido
+import threading
 import logging
 from typing import Dict, Any, Optional
 
@@ -13,6 +13,44 @@ from .error_manager import ErrorManager
 from .input_validator import InputValidator
 from midi.scales import MidiScale
 
+# Scale parameters that must all be set before a scale can be applied
+_SCALE_REQUIRED = ('root', 'type', 'start_oct', 'end_oct')
+
+
+class FastCharLCD(CharLCD):
+    """
+    RPLCD's GPIO LCD with each 4-bit nibble put on the data pins by a single
+    GPIO.output() call instead of one call per pin.
+    """
+    
+    def __init__(self, *args, pins_data, **kwargs):
+        # The base __init__ already sends commands through _write_nibble, so its
+        # lookups are set up first: data pins D4..D7 (the last four in either
+        # bus mode) and the per-pin levels for every nibble value
+        self._data_pins = list(pins_data[-4:])
+        self._nibble_levels = [[(value >> bit) & 1 for bit in range(4)] for value in range(16)]
+        super().__init__(*args, pins_data=pins_data, **kwargs)
+    
+    def _write_nibble(self, value: int):
+        """Put a nibble on the data bus and pulse enable"""
+        GPIO.output(self._data_pins, self._nibble_levels[value & 0x0F])
+        GPIO.output(self.pins.e, 1)
+        time.sleep(0.000001)  # enable must stay high > 450ns
+        GPIO.output(self.pins.e, 0)
+        time.sleep(0.000037)  # let the LCD latch the nibble before the next one
+    
+    def _write4bits(self, value: int):
+        self._write_nibble(value)
+        time.sleep(0.0001)  # commands need > 37us to settle
+    
+    def _send_data(self, value: int):
+        """Send one character byte, without the extra settle time commands need"""
+        GPIO.output(self.pins.rs, 1)
+        if self.pins.rw is not None:
+            GPIO.output(self.pins.rw, 0)
+        self._write_nibble(value >> 4)
+        self._write_nibble(value)
+
 
 class DisplayController:
     """
@@ -39,7 +77,7 @@ class DisplayController:
         # Initialize LCD hardware
         self.lcd_width = 16
         self.lcd_height = 2
-        self.lcd = CharLCD(
+        self.lcd = FastCharLCD(
             pin_rs=25, pin_rw=24, pin_e=23,
             pins_data=[17, 18, 27, 22],
             numbering_mode=GPIO.BCM,
@@ -50,13 +88,32 @@ class DisplayController:
         self.state_manager = StateManager()
         self.validator = InputValidator()
         self.input_manager = InputManager(self.state_manager)
-        self.display = DisplayRenderer(self.lcd, self.state_manager, self.lcd_width, self.lcd_height)
-        self.error_handler = ErrorManager(self.lcd, error_display_duration=1.0)
+        # Serializes every write to the LCD, whichever thread it comes from
+        self._lcd_lock = threading.RLock()
+        self.display = DisplayRenderer(self.lcd, self.state_manager, self.lcd_width, self.lcd_height,
+                                       lcd_lock=self._lcd_lock)
+        self.error_handler = ErrorManager(self.lcd, error_display_duration=1.0, lcd_lock=self._lcd_lock)
         
         # Connect components
         self.display.set_midi_device(midi_device)
+        self.display.set_error_manager(self.error_handler)
         self.state_manager.register_observer(self.on_state_changed)
         self.error_handler.set_callback(self.on_error)
+        self.error_handler.set_clear_callback(lambda: self.display.update_display(force=True))
+        
+        # Pending switch to the port being scrolled to, see _scroll_port_options.
+        # One worker waits out the delay; the deadline and index are only
+        # touched under _port_commit_cond
+        self.port_commit_delay = 0.15  # seconds
+        self._port_commit_cond = threading.Condition()
+        self._port_commit_deadline: Optional[float] = None
+        self._port_commit_idx = 0
+        self._closing = False
+        self._port_commit_thread = threading.Thread(target=self._run_port_commits, daemon=True)
+        self._port_commit_thread.start()
+        
+        # (page, param) -> (validator, apply callback, error message) for save_param
+        self._param_dispatch = self._build_param_dispatch()
         
         # Set up input handlers
         self.setup_input_handlers()
@@ -73,15 +130,15 @@ class DisplayController:
         self.state_manager.channel = self.midi_device.channel
         
         # Set sequencer's current BPM
-        self.state_manager.time_params['bpm'] = self.sequencer.bpm
+        self.state_manager.set_time_param('bpm', self.sequencer.bpm)
         
         # Set pattern length for current channel
         channel = self.midi_device.channel
         if channel in self.sequencer.channel_lengths:
-            self.state_manager.time_params['pattern_length'] = self.sequencer.channel_lengths[channel]
+            self.state_manager.set_time_param('pattern_length', self.sequencer.channel_lengths[channel])
             
         # Set steps per bar
-        self.state_manager.time_params['steps_per_bar'] = self.sequencer.steps_per_bar
+        self.state_manager.set_time_param('steps_per_bar', self.sequencer.steps_per_bar)
     
     def setup_input_handlers(self):
         """Set up all input handlers"""
@@ -108,35 +165,37 @@ class DisplayController:
     
     def on_error(self, message: str):
         """Called when an error occurs"""
-        self.logger.error(f"Display error: {message}")
+        self.logger.error("Display error: %s", message)
     
     def update_display(self):
-        """Update the display with current state"""
-        if self.error_handler.error_displayed:
-            if self.error_handler.clear_error():
-                self.display.update_display(force=True)
-        else:
+        """Update the display with current state, unless an error is showing"""
+        # The error manager repaints the page itself once the error expires
+        if not self.error_handler.error_displayed:
             self.display.update_display()
     
     def handle_enter(self):
         """Handle enter key press"""
-        if self.state_manager.editing:
-            # Save parameter when exiting edit mode
-            if self.state_manager.edit_buffer:  # Only update if new input
-                self.save_param(self.state_manager.edit_buffer)
+        state = self.state_manager
+        # Saving and leaving edit mode can change several things; redraw once
+        with state.batch():
+            if state.editing:
+                # Save parameter when exiting edit mode
+                if state.edit_buffer:  # Only update if new input
+                    self.save_param(state.edit_buffer)
+                
+                # Play note if exiting note edit mode
+                note_params = state.note_params
+                if (state.get_current_page() == 'NOTE' and
+                        state.get_current_param() == 'note' and
+                        note_params['note'] is not None):
+                    self.midi_device.send_note(
+                        note_params['note'],
+                        note_params['duration'],
+                        self.midi_device.channel
+                    )
             
-            # Play note if exiting note edit mode
-            if (self.state_manager.get_current_page() == 'NOTE' and
-                    self.state_manager.get_current_param() == 'note' and
-                    self.state_manager.note_params['note'] is not None):
-                self.midi_device.send_note(
-                    self.state_manager.note_params['note'],
-                    self.state_manager.note_params['duration'],
-                    self.midi_device.channel
-                )
-        
-        # Toggle edit mode
-        self.state_manager.toggle_edit_mode()
+            # Toggle edit mode
+            state.toggle_edit_mode()
     
     def handle_number(self, key: str):
         """Handle numeric input"""
@@ -159,14 +218,102 @@ class DisplayController:
         else:
             self.state_manager.current_port_idx = (self.state_manager.current_port_idx + 1) % len(self.midi_device.midi_outputs)
         
-        # Update MIDI port
+        self.update_display()
+        
+        # Opening a port is slow, so only switch once the user stops scrolling:
+        # each scroll pushes the deadline back
+        with self._port_commit_cond:
+            self._port_commit_idx = self.state_manager.current_port_idx
+            self._port_commit_deadline = time.monotonic() + self.port_commit_delay
+            self._port_commit_cond.notify()
+    
+    def _run_port_commits(self):
+        """Worker loop: open the scrolled-to port once its deadline passes"""
+        cond = self._port_commit_cond
+        while True:
+            with cond:
+                while not self._closing:
+                    deadline = self._port_commit_deadline
+                    if deadline is None:
+                        cond.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    cond.wait(remaining)
+                if self._closing:
+                    return
+                self._port_commit_deadline = None
+                port_idx = self._port_commit_idx
+            self._commit_port(port_idx)
+    
+    def _commit_port(self, port_idx: int):
+        """Open the port the user scrolled to; runs on the port commit worker"""
+        # The port swap and any error message go through the same locks as the
+        # input thread's writes
         try:
-            self.midi_device.outport.close()
-            self.midi_device.outport = mido.open_output(self.midi_device.midi_outputs[self.state_manager.current_port_idx])
-            self.update_display()
+            self.midi_device.open_port(self.midi_device.midi_outputs[port_idx])
         except Exception as e:
             self.error_handler.show_error("Port error", details=str(e))
     
+    def _build_param_dispatch(self) -> Dict[tuple, tuple]:
+        """
+        Build the save_param dispatch table.
+        
+        Returns:
+            Dict mapping (page, param) to (validator, apply callback, error message)
+        """
+        validator = self.validator
+        state = self.state_manager
+        return {
+            ('MIDI', 'channel'): (validator.validate_channel, self.midi_device.set_channel, "Invalid channel"),
+            ('MIDI', 'port'): (lambda v: validator.validate_port_index(v, len(self.midi_device.midi_outputs)),
+                               self._save_port, "Invalid port"),
+            ('NOTE', 'note'): (validator.validate_note,
+                               lambda val: state.note_params.__setitem__('note', val), "Invalid note"),
+            ('NOTE', 'duration'): (validator.validate_duration,
+                                   lambda val: state.note_params.__setitem__('duration', val), "Invalid duration"),
+            ('TIME', 'bpm'): (validator.validate_bpm, self._save_bpm, "Invalid BPM"),
+            ('TIME', 'pattern_length'): (lambda v: validator.validate_pattern_length(v, self.sequencer.max_steps),
+                                         self._save_pattern_length, "Invalid length"),
+            # TODO: Implement steps_per_bar in sequencer
+            ('TIME', 'steps_per_bar'): (validator.validate_steps_per_bar,
+                                        lambda val: state.set_time_param('steps_per_bar', val), "Invalid steps"),
+            ('SCALE', 'root'): (lambda v: validator.validate_scale_root(v, MidiScale.NOTE_NAMES),
+                                lambda val: state.set_scale_param('root', val), "Invalid root"),
+            ('SCALE', 'type'): (lambda v: validator.validate_scale_type(v, MidiScale.SCALE_TYPES),
+                                lambda val: state.set_scale_param('type', val), "Invalid type"),
+            ('SCALE', 'start_oct'): (validator.validate_octave,
+                                     lambda val: self._save_octave('start_oct', val), "Invalid octave"),
+            ('SCALE', 'end_oct'): (validator.validate_octave,
+                                   lambda val: self._save_octave('end_oct', val), "Invalid octave"),
+        }
+    
+    def _save_port(self, val: int):
+        """Switch the MIDI output to the port at index val"""
+        # Swapped under the device's lock, so the sender never writes to a closed port
+        self.midi_device.open_port(self.midi_device.midi_outputs[val])
+        self.state_manager.current_port_idx = val
+    
+    def _save_bpm(self, val: int):
+        """Store the BPM and pass it to the sequencer"""
+        self.state_manager.set_time_param('bpm', val)
+        self.sequencer.set_bpm(val)
+    
+    def _save_pattern_length(self, val: int):
+        """Store the pattern length and apply it to the current channel"""
+        self.state_manager.set_time_param('pattern_length', val)
+        self.sequencer.set_channel_steps(self.midi_device.channel, val)
+    
+    def _save_octave(self, param: str, val: int):
+        """Store start_oct/end_oct unless it would cross the other octave bound"""
+        if param == 'start_oct' and val > self.state_manager.scale_params['end_oct']:
+            self.error_handler.show_error("Start > End oct")
+        elif param == 'end_oct' and val < self.state_manager.scale_params['start_oct']:
+            self.error_handler.show_error("End < Start oct")
+        else:
+            self.state_manager.set_scale_param(param, val)
+    
     def save_param(self, value: str):
         """
         Save parameter value after editing.
@@ -179,97 +326,23 @@ class DisplayController:
 
         page = self.state_manager.get_current_page()
         param = self.state_manager.get_current_param()
+        entry = self._param_dispatch.get((page, param))
 
         try:
-            if param == 'channel':
-                valid, val = self.validator.validate_channel(value)
-                if valid:
-                    self.midi_device.set_channel(val)
-                else:
-                    self.error_handler.show_error("Invalid channel")
-
-            elif param == 'port':
-                valid, val = self.validator.validate_port_index(value, len(self.midi_device.midi_outputs))
-                if valid:
-                    self.midi_device.outport.close()
-                    self.midi_device.outport = mido.open_output(self.midi_device.midi_outputs[val])
-                    self.state_manager.current_port_idx = val
-                else:
-                    self.error_handler.show_error("Invalid port")
-
-            elif param == 'note':
-                valid, val = self.validator.validate_note(value)
-                if valid:
-                    self.state_manager.note_params['note'] = val
-                else:
-                    self.error_handler.show_error("Invalid note")
-
-            elif param == 'duration':
-                valid, val = self.validator.validate_duration(value)
+            if entry is not None:
+                validate, apply, error_message = entry
+                valid, val = validate(value)
                 if valid:
-                    self.state_manager.note_params['duration'] = val
+                    apply(val)
                 else:
-                    self.error_handler.show_error("Invalid duration")
+                    self.error_handler.show_error(error_message)
 
-            elif page == 'TIME':
-                if param == 'bpm':
-                    valid, val = self.validator.validate_bpm(value)
-                    if valid:
-                        self.state_manager.time_params['bpm'] = val
-                        self.sequencer.set_bpm(val)
-                    else:
-                        self.error_handler.show_error("Invalid BPM")
-                elif param == 'pattern_length':
-                    valid, val = self.validator.validate_pattern_length(value, self.sequencer.max_steps)
-                    if valid:
-                        self.state_manager.time_params['pattern_length'] = val
-                        self.sequencer.set_channel_steps(self.midi_device.channel, val)
-                    else:
-                        self.error_handler.show_error("Invalid length")
-                elif param == 'steps_per_bar':
-                    valid, val = self.validator.validate_steps_per_bar(value)
-                    if valid:
-                        self.state_manager.time_params['steps_per_bar'] = val
-                        # TODO: Implement steps_per_bar in sequencer
-                    else:
-                        self.error_handler.show_error("Invalid steps")
-
-            elif page == 'SCALE':
-                if param == 'root':
-                    valid_notes = list(MidiScale.NOTE_TO_MIDI.keys())
-                    valid, val = self.validator.validate_scale_root(value, valid_notes)
-                    if valid:
-                        self.state_manager.scale_params['root'] = val
-                    else:
-                        self.error_handler.show_error("Invalid root")
-
-                elif param == 'type':
-                    valid_types = [attr.replace('_INTERVALS', '')
-                                  for attr in dir(MidiScale)
-                                  if attr.endswith('_INTERVALS')]
-                    valid, val = self.validator.validate_scale_type(value, valid_types)
-                    if valid:
-                        self.state_manager.scale_params['type'] = val
-                    else:
-                        self.error_handler.show_error("Invalid type")
-
-                elif param in ['start_oct', 'end_oct']:
-                    valid, val = self.validator.validate_octave(value)
-                    if valid:
-                        if param == 'start_oct' and val > self.state_manager.scale_params['end_oct']:
-                            self.error_handler.show_error("Start > End oct")
-                        elif param == 'end_oct' and val < self.state_manager.scale_params['start_oct']:
-                            self.error_handler.show_error("End < Start oct")
-                        else:
-                            self.state_manager.scale_params[param] = val
-                    else:
-                        self.error_handler.show_error("Invalid octave")
-
-                # Apply scale changes if all parameters are valid
-                if all([v is not None for k, v in self.state_manager.scale_params.items() if k != 'apply']):
+            if page == 'SCALE':
+                # Apply scale changes if enabled and all parameters are valid
+                scale_params = self.state_manager.scale_params
+                if scale_params['apply'] and all(scale_params[k] is not None for k in _SCALE_REQUIRED):
                     try:
-                        if self.state_manager.scale_params['apply']:
-                            self.apply_scale_to_pattern()
+                        self.apply_scale_to_pattern()
                     except Exception as e:
                         self.error_handler.show_error("Scale error", details=str(e))
 
@@ -310,9 +383,6 @@ class DisplayController:
                 self.state_manager.scale_params['end_oct']
             )
             
-            # Flatten scale into single list of notes
-            all_notes = [note for octave in scale.values() for note in octave]
-            
             # Let sequencer apply the scale to the pattern
             self.sequencer.apply_random_pattern_from_scale(
                 self.midi_device.channel,
@@ -328,10 +398,16 @@ class DisplayController:
     def close(self):
         """Clean up resources on shutdown"""
         self.logger.info("Shutting down DisplayController")
-        self.lcd.cursor_pos = (0, 0)
-        self.lcd.write_string("Shutting down...")
-        self.lcd.cursor_pos = (1, 0)
-        self.lcd.write_string("Goodbye!")
-        time.sleep(1)
-        self.lcd.clear()
-        self.lcd.close()
+        self.error_handler.cancel()
+        with self._port_commit_cond:
+            self._closing = True
+            self._port_commit_cond.notify()
+        self._port_commit_thread.join()
+        with self._lcd_lock:
+            self.lcd.cursor_pos = (0, 0)
+            self.lcd.write_string("Shutting down...")
+            self.lcd.cursor_pos = (1, 0)
+            self.lcd.write_string("Goodbye!")
+            time.sleep(1)
+            self.lcd.clear()
+            self.lcd.close()
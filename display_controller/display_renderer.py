@@ -1,64 +1,162 @@
 # display_controller/display_renderer.py
-import time
+import threading
 from typing import Optional
 
+# SCALE parameters edited by scrolling through choices rather than typing
+_SCALE_CHOICE_PARAMS = frozenset({'root', 'type', 'apply'})
+
 class DisplayRenderer:
     """
     Handles the rendering of content to the LCD display.
     """
     
-    def __init__(self, lcd_display, state_manager, lcd_width: int = 16, lcd_height: int = 2):
+    def __init__(self, lcd_display, state_manager, lcd_width: int = 16, lcd_height: int = 2,
+                 lcd_lock: Optional[threading.RLock] = None):
         """
         Initialize the display renderer.
         
         Args:
-            lcd_display: LCD display object with clear(), cursor_pos and write_string() methods
+            lcd_display: LCD display object with cursor_pos and write_string()
             state_manager: StateManager instance to get display content from
             lcd_width: Width of the LCD in characters
             lcd_height: Height of the LCD in lines
+            lcd_lock: Lock shared by everything that writes to lcd_display
         """
         self.lcd = lcd_display
+        # Held for every write so another writer can't interleave its nibbles with ours
+        self._lcd_lock = lcd_lock or threading.RLock()
         self.state_manager = state_manager
         self.lcd_width = lcd_width
         self.lcd_height = lcd_height
-        self.last_update = time.time()
-        self.update_interval = 0.1  # 100ms refresh rate
         self.midi_device = None  # Will be set by DisplayController
+        self.error_manager = None  # Will be set by DisplayController
+        
+        # Rows currently on the LCD and the rows being built for the next frame
+        self._last_lines = [''] * lcd_height
+        self._framebuf = [' ' * lcd_width] * lcd_height
+        
+        # Rows are always exactly lcd_width characters: padded and truncated
+        # in one format call, with a blank row for anything not rendered
+        self._fit_row = ('{:<%d.%d}' % (lcd_width, lcd_width)).format
+        self._blank_row = ' ' * lcd_width
+        
+        # Where the LCD cursor was left by our last write, or None if unknown
+        self._cursor = None
+        
+        # Updates requested while a render is running (from another thread or
+        # a callback) are folded into one more pass by the running render
+        self._render_lock = threading.Lock()
+        self._rendering = False
+        self._render_pending = False
+        self._force_pending = False
         
     def set_midi_device(self, midi_device):
         """Set the MIDI device reference"""
         self.midi_device = midi_device
     
+    def set_error_manager(self, error_manager):
+        """Set the ErrorManager whose messages renders must not overwrite"""
+        self.error_manager = error_manager
+    
     def update_display(self, force: bool = False):
         """
         Update the LCD display with current state.
         
+        Called on every state change; rows that haven't changed cost nothing.
+        If a render is already in progress the request is queued and handled
+        by that render once it finishes its current pass.
+        
+        Args:
+            force: Repaint every row, even those that appear unchanged
+        """
+        with self._render_lock:
+            self._render_pending = True
+            self._force_pending = self._force_pending or force
+            if self._rendering:
+                return
+            self._rendering = True
+        
+        try:
+            while True:
+                with self._render_lock:
+                    if not self._render_pending:
+                        self._rendering = False
+                        return
+                    force = self._force_pending
+                    self._render_pending = self._force_pending = False
+                with self._lcd_lock:
+                    self._render(force)
+        except Exception:
+            with self._render_lock:
+                self._rendering = False
+            raise
+    
+    def _render(self, force: bool):
+        """
+        Render the current page and write the changed rows to the LCD.
+        
         Args:
-            force: Force update even if update interval hasn't elapsed
+            force: Repaint every row, even those that appear unchanged
         """
-        current_time = time.time()
-        if not force and (current_time - self.last_update) < self.update_interval:
+        # Checked here, under the LCD lock, since an error can be shown from
+        # another thread after the caller's check; its clear forces a repaint
+        if self.error_manager is not None and self.error_manager.error_displayed:
             return
-            
-        self.last_update = current_time
-        self.lcd.clear()
         
-        # Delegate to appropriate page renderer
+        # Forced updates repaint every row, since something else (e.g. an
+        # error message) may have written to the LCD behind our back
+        if force:
+            self._last_lines = [''] * self.lcd_height
+            self._cursor = None
+        
+        # Delegate to appropriate page renderer, looking up the selection once per frame
+        self._framebuf = [self._blank_row] * self.lcd_height
         current_page = self.state_manager.get_current_page()
+        curr_param = self.state_manager.get_current_param()
+        editing = self.state_manager.editing
         if current_page == 'MIDI':
-            self._render_midi_page()
+            self._render_midi_page(curr_param, editing)
         elif current_page == 'NOTE':
-            self._render_note_page()
+            self._render_note_page(curr_param, editing)
         elif current_page == 'TIME':
-            self._render_time_page()
+            self._render_time_page(curr_param, editing)
         elif current_page == 'SCALE':
-            self._render_scale_page()
+            self._render_scale_page(curr_param, editing)
+        
+        self._flush_rows()
+    
+    def _flush_rows(self):
+        """Write only the changed span of each row that differs from the LCD"""
+        width = self.lcd_width
+        for row, text in enumerate(self._framebuf):
+            last = self._last_lines[row]
+            if text == last:
+                continue
+            
+            if len(last) != width:
+                first, end = 0, width
+            else:
+                first = 0
+                while text[first] == last[first]:
+                    first += 1
+                end = width
+                while text[end - 1] == last[end - 1]:
+                    end -= 1
+            
+            # Each cursor_pos assignment costs an LCD command, so skip it when
+            # the previous write already left the cursor here
+            if self._cursor != (row, first):
+                self.lcd.cursor_pos = (row, first)
+            self.lcd.write_string(text[first:end])
+            self._last_lines[row] = text
+            # A write reaching the end of the row leaves the cursor wherever the
+            # LCD's line wrapping put it
+            self._cursor = (row, end) if end < width else None
     
-    def _render_midi_page(self):
+    def _render_midi_page(self, curr_param: str, editing: bool):
         """Render the MIDI configuration page"""
         if not self.midi_device:
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string("MIDI device not set")
+            self._framebuf[0] = self._fit_row("MIDI device not set")
             return
             
         channel_str = f"CH:{self.midi_device.channel}"
@@ -67,114 +165,106 @@ class DisplayRenderer:
         except (IndexError, AttributeError):
             port_str = "Port: Not found"
         
-        curr_param = self.state_manager.get_current_param()
-        
         if curr_param == 'channel':
             # Editing channel
-            if self.state_manager.editing:
-                channel_str = f"CH:{self.state_manager.edit_buffer}"
-                if len(self.state_manager.edit_buffer) < 3:
-                    channel_str += "_"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f"*{channel_str}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f" {port_str}")
+            if editing:
+                channel_str = "CH:" + self.state_manager.edit_display
+            self._framebuf[0] = self._fit_row(f"*{channel_str}")
+            self._framebuf[1] = self._fit_row(f" {port_str}")
         else:  # Port parameter
-            if self.state_manager.editing:
+            if editing:
                 port_str = f"Port:{self.midi_device.midi_outputs[self.state_manager.current_port_idx][:6]} [<>]"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f" {channel_str}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f"*{port_str}")
+            self._framebuf[0] = self._fit_row(f" {channel_str}")
+            self._framebuf[1] = self._fit_row(f"*{port_str}")
     
-    def _render_note_page(self):
+    def _render_note_page(self, curr_param: str, editing: bool):
         """Render the note player page"""
         note = str(self.state_manager.note_params['note']) if self.state_manager.note_params['note'] else '---'
         dur = str(self.state_manager.note_params['duration'])
         
-        curr_param = self.state_manager.get_current_param()
-        
         if curr_param == 'note':  # Note parameter
-            if self.state_manager.editing:
-                note = self.state_manager.edit_buffer
-                if len(self.state_manager.edit_buffer) < 3:
-                    note += "_"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f"*Note:{note}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f" Dur:{dur}")
+            if editing:
+                note = self.state_manager.edit_display
+            self._framebuf[0] = self._fit_row(f"*Note:{note}")
+            self._framebuf[1] = self._fit_row(f" Dur:{dur}")
         else:  # Duration parameter
-            if self.state_manager.editing:
-                dur = self.state_manager.edit_buffer
-                if len(self.state_manager.edit_buffer) < 3:
-                    dur += "_"
-            self.lcd.cursor_pos = (0, 0)
-            self.lcd.write_string(f" Note:{note}")
-            self.lcd.cursor_pos = (1, 0)
-            self.lcd.write_string(f"*Dur:{dur}")
+            if editing:
+                dur = self.state_manager.edit_display
+            self._framebuf[0] = self._fit_row(f" Note:{note}")
+            self._framebuf[1] = self._fit_row(f"*Dur:{dur}")
     
-    def _render_time_page(self):
+    def _render_time_page(self, curr_param: str, editing: bool):
         """Render the timing configuration page"""
+        # Bind everything the loop touches to locals
+        state = self.state_manager
+        values = state.time_params_str
+        format_text = state.format_parameter_text
+        framebuf = self._framebuf
+        fit_row = self._fit_row
+        
         # Get the visible parameters based on the current scroll offset
-        visible_params = self.state_manager.get_visible_params('TIME')
+        visible_params = state.get_visible_params('TIME')
         
         for i, param in enumerate(visible_params):
             # Get the current value of the parameter
-            value = str(self.state_manager.time_params[param])
+            value = values[param]
             
             # Determine if this parameter is selected
-            selected = param == self.state_manager.get_current_param()
+            selected = param == curr_param
             
             # Handle editing mode
-            if selected and self.state_manager.editing:
-                display_value = self.state_manager.edit_buffer
+            if selected and editing:
+                display_value = state.edit_buffer
             else:
                 display_value = value
             
             # Format text
-            param_text = self.state_manager.format_parameter_text(
+            param_text = format_text(
                 param,
                 display_value,
                 selected=selected,
-                editing=(selected and self.state_manager.editing)
+                editing=(selected and editing)
             )
             
-            # Set cursor position and display the text
-            self.lcd.cursor_pos = (i, 0)
-            self.lcd.write_string(param_text)
+            # Queue the text for this row
+            framebuf[i] = fit_row(param_text)
     
-    def _render_scale_page(self):
+    def _render_scale_page(self, curr_param: str, editing: bool):
         """Render the scale configuration page"""
+        # Bind everything the loop touches to locals
+        state = self.state_manager
+        values = state.scale_params_str
+        format_text = state.format_parameter_text
+        framebuf = self._framebuf
+        fit_row = self._fit_row
+        
         # Get the visible parameters based on the current scroll offset
-        visible_params = self.state_manager.get_visible_params('SCALE')
+        visible_params = state.get_visible_params('SCALE')
         
         for i, param in enumerate(visible_params):
             # Get the current value of the parameter
-            value = str(self.state_manager.scale_params[param])
+            value = values[param]
             
             # Determine if this parameter is selected
-            selected = param == self.state_manager.get_current_param()
+            selected = param == curr_param
             
             # Handle editing mode
-            if selected and self.state_manager.editing:
-                if param in ['root', 'type']:
-                    display_value = f"{value} [<>]"
-                elif param == 'apply':
-                    # For 'apply' parameter, indicate it can be toggled using scrolling
-                    display_value = f"{value} [<>]"
+            if selected and editing:
+                if param in _SCALE_CHOICE_PARAMS:
+                    # Indicate the value is changed by scrolling
+                    display_value = value + " [<>]"
                 else:
-                    display_value = self.state_manager.edit_buffer
+                    display_value = state.edit_buffer
             else:
                 display_value = value
             
             # Format text intelligently
-            param_text = self.state_manager.format_parameter_text(
+            param_text = format_text(
                 param,
                 display_value,
                 selected=selected,
-                editing=(selected and self.state_manager.editing)
+                editing=(selected and editing)
             )
             
-            # Set cursor position and display the text
-            self.lcd.cursor_pos = (i, 0)
-            self.lcd.write_string(param_text)
+            # Queue the text for this row
+            framebuf[i] = fit_row(param_text)
@@ -1,6 +1,8 @@
 # display_controller/error_manager.py
 import time
 import logging
+import threading
+from collections import deque
 from typing import Optional, Callable
 
 
@@ -10,21 +12,26 @@ class ErrorManager:
     and configurable error display behavior.
     """
     
-    def __init__(self, lcd_display, error_display_duration: float = 1.0):
+    def __init__(self, lcd_display, error_display_duration: float = 1.0,
+                 lcd_lock: Optional[threading.RLock] = None):
         """
         Initialize the error manager.
         
         Args:
-            lcd_display: LCD display object with clear() and write_string() methods
+            lcd_display: LCD display object with cursor_pos and write_string()
             error_display_duration: How long to display errors (seconds)
+            lcd_lock: Lock shared by everything that writes to lcd_display
         """
         self.lcd = lcd_display
+        self._lcd_lock = lcd_lock or threading.RLock()
         self.error_displayed = False
         self.error_start_time = 0
         self.error_display_duration = error_display_duration
-        self.error_history = []  # Store recent errors
         self.max_history = 10    # Maximum number of errors to keep in history
+        self.error_history = deque(maxlen=self.max_history)  # Store recent errors
         self._on_error_callback = None
+        self._on_clear_callback = None
+        self._clear_timer: Optional[threading.Timer] = None
         
         # Set up logging
         self.logger = logging.getLogger('midi_calculator.error')
@@ -33,6 +40,10 @@ class ErrorManager:
         """Set a callback to be called when an error occurs"""
         self._on_error_callback = callback
         
+    def set_clear_callback(self, callback: Callable[[], None]):
+        """Set a callback to be called when an error has been shown long enough"""
+        self._on_clear_callback = callback
+        
     def show_error(self, message: str, log_level: str = 'error', details: Optional[str] = None):
         """
         Display and log an error message.
@@ -42,16 +53,26 @@ class ErrorManager:
             log_level: Logging level ('debug', 'info', 'warning', 'error', 'critical')
             details: Optional detailed error information for logging only
         """
-        # Display on LCD
-        self.lcd.clear()
-        self.lcd.cursor_pos = (0, 0)
-        self.lcd.write_string("Error:")
-        self.lcd.cursor_pos = (1, 0)
-        self.lcd.write_string(message[:16])  # Truncate to LCD width
-        
-        # Set error state
-        self.error_displayed = True
-        self.error_start_time = time.time()
+        with self._lcd_lock:
+            # Display on LCD, padding both rows so the old page is overwritten without a clear()
+            self.lcd.cursor_pos = (0, 0)
+            self.lcd.write_string("Error:".ljust(16))
+            self.lcd.cursor_pos = (1, 0)
+            self.lcd.write_string(message[:16].ljust(16))  # Truncate to LCD width
+            
+            # Set error state
+            self.error_displayed = True
+            self.error_start_time = time.monotonic()
+            
+            # Clear the error once its display time is up, restarting the
+            # countdown if a previous error is still showing
+            if self._clear_timer is not None:
+                self._clear_timer.cancel()
+            timer = threading.Timer(self.error_display_duration, self._auto_clear)
+            timer.args = (timer,)
+            timer.daemon = True
+            self._clear_timer = timer
+            timer.start()
         
         # Add to history (with timestamp)
         error_entry = {
@@ -59,18 +80,14 @@ class ErrorManager:
             'message': message,
             'details': details
         }
-        self.error_history.append(error_entry)
-        
-        # Keep history within size limit
-        if len(self.error_history) > self.max_history:
-            self.error_history.pop(0)
+        self.error_history.append(error_entry)  # Oldest entry drops off when full
         
         # Log the error
         log_method = getattr(self.logger, log_level.lower(), self.logger.error)
         if details:
-            log_method(f"{message} - Details: {details}")
+            log_method("%s - Details: %s", message, details)
         else:
-            log_method(message)
+            log_method("%s", message)
             
         # Trigger callback if set
         if self._on_error_callback:
@@ -83,11 +100,30 @@ class ErrorManager:
         Returns:
             bool: True if the error was cleared, False otherwise
         """
-        if self.error_displayed and (time.time() - self.error_start_time) > self.error_display_duration:
+        if self.error_displayed and (time.monotonic() - self.error_start_time) > self.error_display_duration:
             self.error_displayed = False
             return True
         return False
     
+    def _auto_clear(self, timer: threading.Timer):
+        """Timer callback: drop the error and let the owner redraw the page"""
+        # Holding the LCD lock through the redraw keeps a new error from being
+        # painted over; a timer superseded by a newer error does nothing
+        with self._lcd_lock:
+            if timer is not self._clear_timer:
+                return
+            self._clear_timer = None
+            self.error_displayed = False
+            if self._on_clear_callback:
+                self._on_clear_callback()
+    
+    def cancel(self):
+        """Stop any pending auto-clear, e.g. on shutdown"""
+        with self._lcd_lock:
+            if self._clear_timer is not None:
+                self._clear_timer.cancel()
+                self._clear_timer = None
+    
     def get_recent_errors(self, count: int = 5):
         """
         Get the most recent errors.
@@ -98,4 +134,4 @@ class ErrorManager:
         Returns:
             List of error entries
         """
-        return self.error_history[-count:]
+        return list(self.error_history)[-count:]
@@ -8,6 +8,9 @@ class InputManager:
     Manages keyboard input and maps keys to functions.
     """
     
+    # Actions whose handler takes the name of the pressed key
+    _KEY_NAME_ACTIONS = frozenset({'number_input'})
+    
     def __init__(self, state_manager):
         """
         Initialize the input manager.
@@ -18,6 +21,8 @@ class InputManager:
         self.state_manager = state_manager
         self.action_handlers = {}  # Dictionary of action handlers
         self.key_mappings = {}     # Dictionary mapping keys to actions
+        self._scan_code_handlers = {}  # Scan code -> resolved callback
+        self._hook = None          # Our keyboard hook, once listeners are set up
         
     def register_action_handler(self, action: str, handler: Callable):
         """
@@ -59,23 +64,64 @@ class InputManager:
     
     def map_key(self, key: str, action: str):
         """
-        Map a key to an action.
+        Map a key to an action. Once listeners are set up the new mapping
+        takes effect immediately, without touching the keyboard hook.
         
         Args:
             key: Keyboard key string
             action: Action identifier string
         """
         self.key_mappings[key] = action
+        if self._hook is not None:
+            self._bind_key(key, action)
+    
+    def _bind_key(self, key: str, action: str):
+        """
+        Resolve a key to its scan codes and a callback for its action handler.
+        
+        Args:
+            key: Keyboard key string
+            action: Action identifier string
+        """
+        handler = self.action_handlers.get(action)
+        if handler is None:
+            callback = None
+        elif action in self._KEY_NAME_ACTIONS:
+            callback = lambda e, h=handler: h(e.name)
+        else:
+            callback = lambda e, h=handler: h()
+        for scan_code in keyboard.key_to_scan_codes(key):
+            if callback is None:
+                self._scan_code_handlers.pop(scan_code, None)
+            else:
+                self._scan_code_handlers[scan_code] = callback
     
     def setup_keyboard_listeners(self):
         """Set up all keyboard listeners based on current mappings"""
-        # Clear any existing handlers first
-        keyboard.unhook_all()
-        
-        # Set up handlers for each mapped key
+        # Resolve each mapped key to its scan codes and its handler once, so a
+        # single hook can call the handler directly. Action handlers must be
+        # registered before this is called.
+        self._scan_code_handlers = {}
         for key, action in self.key_mappings.items():
-            # Use lambda with default arg to avoid late binding issues
-            keyboard.on_press_key(key, lambda e, action=action: self.handle_key_press(e, action))
+            self._bind_key(key, action)
+        
+        # Only our own hook is installed, and only once; later calls just
+        # rebuild the lookup table
+        if self._hook is None:
+            self._hook = keyboard.hook(self._on_key_event)
+    
+    def _on_key_event(self, e):
+        """
+        Dispatch a key-down event to its resolved handler.
+        
+        Args:
+            e: Key event from keyboard library
+        """
+        if e.event_type != keyboard.KEY_DOWN:
+            return
+        callback = self._scan_code_handlers.get(e.scan_code)
+        if callback is not None:
+            callback(e)
     
     def handle_key_press(self, e, action: str):
         """
@@ -85,15 +131,13 @@ class InputManager:
             e: Key event from keyboard library
             action: Action to perform
         """
-        # Special case for number input
-        if action == 'number_input':
-            if 'number_input' in self.action_handlers:
-                self.action_handlers['number_input'](e.name)
+        handler = self.action_handlers.get(action)
+        if handler is None:
             return
-            
-        # Otherwise dispatch to appropriate handler
-        if action in self.action_handlers:
-            self.action_handlers[action]()
+        if action in self._KEY_NAME_ACTIONS:
+            handler(e.name)
+        else:
+            handler()
     
     def handle_number_input(self, key: str):
         """
@@ -1,5 +1,52 @@
 # display_controller/input_validator.py
-from typing import Tuple, Union, List, Any
+import re
+from typing import Tuple, Union, List, Any, Optional
+
+# Legal numeric input, matched up front so bad keystrokes never raise
+_INT_RE = re.compile(r'-?\d+')
+_FLOAT_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+
+
+def _parse_int(value: Union[str, int]) -> Optional[int]:
+    """Parse an integer, returning None instead of raising on bad input"""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, str) and _INT_RE.fullmatch(value):
+        return int(value)
+    return None
+
+
+def _parse_float(value: Union[str, float]) -> Optional[float]:
+    """Parse a decimal number, returning None instead of raising on bad input"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and _FLOAT_RE.fullmatch(value):
+        return float(value)
+    return None
+
+
+def _int_range_validator(lo: int, hi: int, doc: str):
+    """
+    Build a validator for integers in [lo, hi], with the bounds bound as
+    closure constants and a fast path for values that are already ints.
+    
+    Args:
+        lo: Smallest valid value
+        hi: Largest valid value
+        doc: Docstring for the validator
+        
+    Returns:
+        Function mapping a value to (is_valid, validated_value)
+    """
+    def validate(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
+        if type(value) is int:
+            return lo <= value <= hi, value
+        val = _parse_int(value)
+        if val is None:
+            return False, None
+        return lo <= val <= hi, val
+    validate.__doc__ = doc
+    return validate
 
 
 class InputValidator:
@@ -8,41 +55,25 @@ class InputValidator:
     Returns a tuple of (is_valid, validated_value) for each validation method.
     """
     
-    @staticmethod
-    def validate_channel(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
-        """Validate MIDI channel (0-15)"""
-        try:
-            val = int(value)
-            return 0 <= val <= 15, val
-        except (ValueError, TypeError):
-            return False, None
+    validate_channel = staticmethod(_int_range_validator(0, 15, "Validate MIDI channel (0-15)"))
 
-    @staticmethod
-    def validate_note(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
-        """Validate MIDI note (0-127)"""
-        try:
-            val = int(value)
-            return 0 <= val <= 127, val
-        except (ValueError, TypeError):
-            return False, None
+    validate_note = staticmethod(_int_range_validator(0, 127, "Validate MIDI note (0-127)"))
 
     @staticmethod
     def validate_duration(value: Union[str, float]) -> Tuple[bool, Union[float, None]]:
         """Validate note duration (must be positive)"""
-        try:
-            val = float(value)
-            return val > 0, val
-        except (ValueError, TypeError):
+        val = _parse_float(value)
+        if val is None:
             return False, None
+        return val > 0, val
 
     @staticmethod
     def validate_port_index(value: Union[str, int], max_ports: int) -> Tuple[bool, Union[int, None]]:
         """Validate port index (0 to max_ports-1)"""
-        try:
-            val = int(value)
-            return 0 <= val < max_ports, val
-        except (ValueError, TypeError):
+        val = _parse_int(value)
+        if val is None:
             return False, None
+        return 0 <= val < max_ports, val
 
     @staticmethod
     def validate_scale_root(value: str, valid_notes: List[str]) -> Tuple[bool, Union[str, None]]:
@@ -54,14 +85,7 @@ class InputValidator:
         """Validate scale type"""
         return value in valid_types, value if value in valid_types else None
 
-    @staticmethod
-    def validate_octave(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
-        """Validate octave is within MIDI range (-2 to 8)"""
-        try:
-            val = int(value)
-            return -2 <= val <= 8, val
-        except (ValueError, TypeError):
-            return False, None
+    validate_octave = staticmethod(_int_range_validator(-2, 8, "Validate octave is within MIDI range (-2 to 8)"))
 
     @staticmethod
     def validate_boolean(value: Any) -> Tuple[bool, bool]:
@@ -75,29 +99,14 @@ class InputValidator:
                 return True, False
         return False, False
 
-    @staticmethod
-    def validate_bpm(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
-        """Validate BPM (20-300)"""
-        try:
-            val = int(value)
-            return 20 <= val <= 300, val
-        except (ValueError, TypeError):
-            return False, None
+    validate_bpm = staticmethod(_int_range_validator(20, 300, "Validate BPM (20-300)"))
 
     @staticmethod
     def validate_pattern_length(value: Union[str, int], max_steps: int) -> Tuple[bool, Union[int, None]]:
         """Validate pattern length (1 to max_steps)"""
-        try:
-            val = int(value)
-            return 1 <= val <= max_steps, val
-        except (ValueError, TypeError):
+        val = _parse_int(value)
+        if val is None:
             return False, None
+        return 1 <= val <= max_steps, val
             
-    @staticmethod
-    def validate_steps_per_bar(value: Union[str, int]) -> Tuple[bool, Union[int, None]]:
-        """Validate steps per bar (typically 1-64)"""
-        try:
-            val = int(value)
-            return 1 <= val <= 64, val
-        except (ValueError, TypeError):
-            return False, None
+    validate_steps_per_bar = staticmethod(_int_range_validator(1, 64, "Validate steps per bar (typically 1-64)"))
@@ -1,7 +1,16 @@
 # display_controller/state_manager.py
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
 from midi.scales import MidiScale
 
+# Scrollable scale choices and each choice's position, built once at import
+_VALID_NOTES = MidiScale.NOTE_NAMES
+_NOTE_INDEX = {note: i for i, note in enumerate(_VALID_NOTES)}
+_VALID_SCALE_TYPES = MidiScale.SCALE_TYPES
+_SCALE_TYPE_INDEX = {scale_type: i for i, scale_type in enumerate(_VALID_SCALE_TYPES)}
+
 class StateManager:
     """
     Manages the state of the display interface, including pages, parameters,
@@ -23,13 +32,20 @@ class StateManager:
             'SCALE': ['root', 'type', 'start_oct', 'end_oct', 'apply']
         }
         
+        # Per-page (name, params, param count, scrolls) indexed by current_page;
+        # only TIME and SCALE have more params than rows and scroll
+        self._page_info = tuple(
+            (page, tuple(self.params[page]), len(self.params[page]), page in ('TIME', 'SCALE'))
+            for page in self.pages
+        )
+        
         # Parameter abbreviations for display
-        self.param_abbreviations = {
+        self.param_abbreviations = MappingProxyType({
             'pattern_length': 'pattern',
             'steps_per_bar': 'steps#',
             'start_oct': 'start',
             'end_oct': 'end',
-        }
+        })
         
         # Parameter values
         self.current_param_index = 0
@@ -48,29 +64,84 @@ class StateManager:
             'apply': False
         }
         
+        # (page, param) -> the dict holding its value, for get_param_value.
+        # MIDI values live on the MIDI device, so MIDI params aren't listed.
+        self._value_sources = {}
+        for page, values in (('NOTE', self.note_params), ('TIME', self.time_params),
+                             ('SCALE', self.scale_params)):
+            for param in self.params[page]:
+                self._value_sources[(page, param)] = values
+        
+        # Visible parameter windows, keyed by (page, scroll offset)
+        self._visible_params = {}
+        
+        # String forms of the values above for rendering, kept in step by
+        # set_time_param/set_scale_param
+        self.time_params_str = {k: str(v) for k, v in self.time_params.items()}
+        self.scale_params_str = {k: str(v) for k, v in self.scale_params.items()}
+        
         # Edit state
         self.editing = False
         self.edit_buffer = ""
+        self.edit_display = "_"  # edit_buffer as rendered, with its input cursor
         
         # Scroll state for displaying parameters
         self.param_scroll_offset = 0
         
-        # State change observers
-        self._observers = []
+        # State change observers; while batching, notifications only mark dirty
+        self._observers = {}  # Insertion-ordered set of callbacks
+        self._batching = 0
+        self._dirty = False
+        
+        # Row prefixes for format_parameter_text: the full name, then the
+        # abbreviation if any, as (" label:", "*label:") indexed by selection,
+        # each with the longest value that still fits after them
+        self._param_format = {}
+        for page_params in self.params.values():
+            for param in page_params:
+                labels = [param]
+                if param in self.param_abbreviations:
+                    labels.append(self.param_abbreviations[param])
+                self._param_format[param] = tuple(
+                    ((' ' + label + ':', '*' + label + ':'), self.lcd_width - 2 - len(label))
+                    for label in labels
+                )
     
     def register_observer(self, callback):
         """Register a function to be called when state changes"""
-        if callback not in self._observers:
-            self._observers.append(callback)
+        self._observers[callback] = None
     
     def unregister_observer(self, callback):
         """Remove an observer function"""
-        if callback in self._observers:
-            self._observers.remove(callback)
+        self._observers.pop(callback, None)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several state changes into a single observer notification.
+        
+        Observers are notified once when the outermost batch exits, and only
+        if something inside it changed state. Batches may be nested.
+        """
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
+            if self._batching == 0 and self._dirty:
+                self._dirty = False
+                self._fire()
     
     def _notify_observers(self):
-        """Notify all observers that state has changed"""
-        for callback in self._observers:
+        """Notify all observers that state has changed, or defer it while batching"""
+        if self._batching:
+            self._dirty = True
+            return
+        self._fire()
+    
+    def _fire(self):
+        """Call every observer, iterating a snapshot so callbacks may (un)register"""
+        for callback in tuple(self._observers):
             callback()
     
     # Page navigation
@@ -91,15 +162,14 @@ class StateManager:
     # Parameter navigation
     def next_param(self):
         """Move to the next parameter on current page"""
-        page = self.pages[self.current_page]
-        max_params = len(self.params[page])
+        page, params, max_params, scrolls = self._page_info[self.current_page]
         
         # Update selected parameter with wrap-around
         old_index = self.current_param_index
         self.current_param_index = (self.current_param_index + 1) % max_params
         
         # For pages with scrolling parameters
-        if page in ['TIME', 'SCALE']:
+        if scrolls:
             # If we're moving down and at bottom of visible window, scroll down
             if old_index == self.param_scroll_offset + 1:
                 self.param_scroll_offset = (self.param_scroll_offset + 1) % max_params
@@ -111,15 +181,14 @@ class StateManager:
     
     def prev_param(self):
         """Move to the previous parameter on current page"""
-        page = self.pages[self.current_page]
-        max_params = len(self.params[page])
+        page, params, max_params, scrolls = self._page_info[self.current_page]
         
         # Update selected parameter with wrap-around
         old_index = self.current_param_index
         self.current_param_index = (self.current_param_index - 1) % max_params
         
         # For pages with scrolling parameters
-        if page in ['TIME', 'SCALE']:
+        if scrolls:
             # If we're moving up and already at top of visible window, scroll up
             if old_index == self.param_scroll_offset:
                 self.param_scroll_offset = (self.param_scroll_offset - 1) % max_params
@@ -134,7 +203,7 @@ class StateManager:
         """Toggle edit mode for the current parameter"""
         self.editing = not self.editing
         if not self.editing:  # Exiting edit mode
-            self.edit_buffer = ""
+            self._set_edit_buffer("")
         self._notify_observers()
     
     def update_edit_buffer(self, key: str):
@@ -142,20 +211,27 @@ class StateManager:
         if not self.editing:
             return
         
-        # Handle different key types
+        # Handle different key types; rejected keys change nothing, so don't redraw
         if key == '.' and '.' not in self.edit_buffer:
-            self.edit_buffer += key
+            self._set_edit_buffer(self.edit_buffer + key)
         elif key.isdigit() and len(self.edit_buffer) < 4:
-            self.edit_buffer += key
+            self._set_edit_buffer(self.edit_buffer + key)
+        else:
+            return
         
         self._notify_observers()
     
     def remove_last_char(self):
         """Remove the last character from the edit buffer"""
         if self.editing and self.edit_buffer:
-            self.edit_buffer = self.edit_buffer[:-1]
+            self._set_edit_buffer(self.edit_buffer[:-1])
             self._notify_observers()
     
+    def _set_edit_buffer(self, value: str):
+        """Set the edit buffer and its display form (cursor shown while short)"""
+        self.edit_buffer = value
+        self.edit_display = value + "_" if len(value) < 3 else value
+    
     # Parameter scrolling
     def scroll_options(self, direction: str):
         """
@@ -167,8 +243,8 @@ class StateManager:
         if not self.editing:
             return
         
-        page = self.pages[self.current_page]
-        param = self.params[page][self.current_param_index]
+        page, params, _, _ = self._page_info[self.current_page]
+        param = params[self.current_param_index]
         
         # Define which parameters have scrollable options
         option_handlers = {
@@ -195,29 +271,30 @@ class StateManager:
     
     def _scroll_note_options(self, direction: str):
         """Scroll through available note options"""
-        valid_notes = list(MidiScale.NOTE_TO_MIDI.keys())
-        current_idx = valid_notes.index(self.scale_params['root'])
-        if direction == 'prev':
-            new_idx = (current_idx - 1) % len(valid_notes)
-        else:
-            new_idx = (current_idx + 1) % len(valid_notes)
-        self.scale_params['root'] = valid_notes[new_idx]
+        step = -1 if direction == 'prev' else 1
+        new_idx = (_NOTE_INDEX[self.scale_params['root']] + step) % len(_VALID_NOTES)
+        self.set_scale_param('root', _VALID_NOTES[new_idx])
     
     def _scroll_scale_type_options(self, direction: str):
         """Scroll through available scale types"""
-        valid_types = [attr.replace('_INTERVALS', '')
-                      for attr in dir(MidiScale)
-                      if attr.endswith('_INTERVALS')]
-        current_idx = valid_types.index(self.scale_params['type'])
-        if direction == 'prev':
-            new_idx = (current_idx - 1) % len(valid_types)
-        else:
-            new_idx = (current_idx + 1) % len(valid_types)
-        self.scale_params['type'] = valid_types[new_idx]
+        step = -1 if direction == 'prev' else 1
+        new_idx = (_SCALE_TYPE_INDEX[self.scale_params['type']] + step) % len(_VALID_SCALE_TYPES)
+        self.set_scale_param('type', _VALID_SCALE_TYPES[new_idx])
     
     def _scroll_boolean_option(self, direction: str):
         """Toggle boolean value regardless of direction"""
-        self.scale_params['apply'] = not self.scale_params['apply']
+        self.set_scale_param('apply', not self.scale_params['apply'])
+    
+    # Parameter setters
+    def set_time_param(self, param: str, value: Any):
+        """Set a TIME parameter and its display string"""
+        self.time_params[param] = value
+        self.time_params_str[param] = str(value)
+    
+    def set_scale_param(self, param: str, value: Any):
+        """Set a SCALE parameter and its display string"""
+        self.scale_params[param] = value
+        self.scale_params_str[param] = str(value)
     
     # State accessors
     def get_current_page(self) -> str:
@@ -226,33 +303,26 @@ class StateManager:
     
     def get_current_param(self) -> str:
         """Get the name of the currently selected parameter"""
-        page = self.pages[self.current_page]
-        return self.params[page][self.current_param_index]
+        return self._page_info[self.current_page][1][self.current_param_index]
     
     def get_param_value(self, page: str, param: str) -> Any:
-        """Get the value of a specific parameter"""
-        if page == 'MIDI' and param == 'channel':
-            # This will need to be handled by DisplayController
-            return None
-        elif page == 'MIDI' and param == 'port':
-            # This will need to be handled by DisplayController
+        """Get the value of a specific parameter (None for MIDI, which DisplayController handles)"""
+        values = self._value_sources.get((page, param))
+        if values is None:
             return None
-        elif page == 'NOTE':
-            return self.note_params[param]
-        elif page == 'TIME':
-            return self.time_params[param]
-        elif page == 'SCALE':
-            return self.scale_params[param]
-        
-        return None
+        return values[param]
     
-    def get_visible_params(self, page: str) -> List[str]:
-        """Get list of parameters visible on screen based on scroll offset"""
-        if page not in self.params:
-            return []
-        
-        params_list = self.params[page]
-        return params_list[self.param_scroll_offset:self.param_scroll_offset + self.lcd_height]
+    def get_visible_params(self, page: str) -> Tuple[str, ...]:
+        """Get the parameters visible on screen based on scroll offset"""
+        key = (page, self.param_scroll_offset)
+        visible = self._visible_params.get(key)
+        if visible is None:
+            if page not in self.params:
+                return ()
+            offset = self.param_scroll_offset
+            visible = tuple(self.params[page][offset:offset + self.lcd_height])
+            self._visible_params[key] = visible
+        return visible
 
     # Helper for parameter formatting
     def format_parameter_text(self, param: str, value: Any, selected: bool = False, editing: bool = False) -> str:
@@ -268,43 +338,80 @@ class StateManager:
         Returns:
             Formatted text string that fits within LCD width
         """
+        # Fast path: a precomputed row prefix that fits the value as-is
+        formats = self._param_format.get(param)
+        if formats is not None:
+            value_str = str(value)
+            value_len = len(value_str)
+            for labels, max_value_len in formats:
+                if value_len <= max_value_len:
+                    param_text = labels[selected] + value_str
+                    if editing and len(param_text) < self.lcd_width:
+                        param_text += "_"
+                    return param_text
+        
         # Selection indicator
         prefix = '*' if selected else ' '
+        value_str = str(value)
+        
+        # Common case: the full name and value already fit
+        param_text = prefix + param + ':' + value_str
+        n = len(param_text)
+        if n <= self.lcd_width:
+            if editing and n < self.lcd_width:
+                param_text += "_"
+            return param_text
+        
+        return _fit_parameter_text(prefix, param, value_str, editing, self.lcd_width,
+                                   self.param_abbreviations.get(param))
 
-        # Try full parameter name first
-        param_text = f"{prefix}{param}:{value}"
 
-        # If it doesn't fit and we have an abbreviation, use that
-        if len(param_text) > self.lcd_width and param in self.param_abbreviations:
-            param_text = f"{prefix}{self.param_abbreviations[param]}:{value}"
+@lru_cache(maxsize=256)
+def _fit_parameter_text(prefix: str, param: str, value_str: str, editing: bool,
+                        lcd_width: int, abbreviation: Optional[str]) -> str:
+    """
+    Shorten a parameter row that doesn't fit the LCD as-is.
+    
+    Args:
+        prefix: Selection indicator, '*' or ' '
+        param: Parameter name
+        value_str: Parameter value as text
+        editing: Whether this parameter is being edited
+        lcd_width: Width of the LCD in characters
+        abbreviation: Short parameter name to try first, if any
+        
+    Returns:
+        Formatted text string that fits within LCD width
+    """
+    # The full name is known not to fit, so try the abbreviation if we have one
+    param_text = f"{prefix}{abbreviation or param}:{value_str}"
 
-        # If still too long, use intelligent truncation
-        if len(param_text) > self.lcd_width:
-            # Calculate available space after prefix, colon and value
-            value_str = str(value)
-            value_len = len(value_str)
+    # If still too long, use intelligent truncation
+    if len(param_text) > lcd_width:
+        # Calculate available space after prefix, colon and value
+        value_len = len(value_str)
 
-            # Calculate maximum parameter name length
-            # (LCD width - prefix - colon - value)
-            max_param_len = self.lcd_width - 1 - 1 - value_len
+        # Calculate maximum parameter name length
+        # (LCD width - prefix - colon - value)
+        max_param_len = lcd_width - 1 - 1 - value_len
 
-            if max_param_len >= 3:  # Ensure minimum readable length
-                # Truncate parameter name while keeping as much as possible
-                truncated_param = param[:max_param_len]
-                param_text = f"{prefix}{truncated_param}:{value}"
+        if max_param_len >= 3:  # Ensure minimum readable length
+            # Truncate parameter name while keeping as much as possible
+            truncated_param = param[:max_param_len]
+            param_text = f"{prefix}{truncated_param}:{value_str}"
+        else:
+            # Last resort: truncate value if parameter is more important
+            max_value_len = lcd_width - 1 - 1 - 3  # Keep at least 3 chars of param
+            if max_value_len >= 2:  # Ensure value is still meaningful
+                truncated_param = param[:3]
+                truncated_value = value_str[:max_value_len]
+                param_text = f"{prefix}{truncated_param}:{truncated_value}"
             else:
-                # Last resort: truncate value if parameter is more important
-                max_value_len = self.lcd_width - 1 - 1 - 3  # Keep at least 3 chars of param
-                if max_value_len >= 2:  # Ensure value is still meaningful
-                    truncated_param = param[:3]
-                    truncated_value = value_str[:max_value_len]
-                    param_text = f"{prefix}{truncated_param}:{truncated_value}"
-                else:
-                    # Extreme case: just show shortened versions of both
-                    param_text = f"{prefix}{param[:3]}:{value_str[:2]}"
+                # Extreme case: just show shortened versions of both
+                param_text = f"{prefix}{param[:3]}:{value_str[:2]}"
 
-        # Handle editing mode by adding cursor indicator
-        if editing and len(param_text) < self.lcd_width:
-            param_text += "_"
+    # Handle editing mode by adding cursor indicator
+    if editing and len(param_text) < lcd_width:
+        param_text += "_"
 
-        return param_text[:self.lcd_width]  # Ensure it fits
+    return param_text[:lcd_width]  # Ensure it fits
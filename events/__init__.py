@@ -1,4 +1,4 @@
 # events/__init__.py
-from .event_publisher import EventPublisher, Event
+from .event_publisher import EventPublisher, Event, get_event_publisher
 
-__all__ = ['EventPublisher', 'Event']
+__all__ = ['EventPublisher', 'Event', 'get_event_publisher']
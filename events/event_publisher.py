@@ -1,8 +1,10 @@
 # events/event_publisher.py
 import time
 import logging
+import threading
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Any, Callable
-from dataclasses import dataclass
 from enum import Enum, auto
 
 
@@ -21,44 +23,38 @@ class EventType(Enum):
     STATE_CHANGE = auto()
 
 
-@dataclass
 class Event:
-    """Event data structure"""
-    type: EventType
-    source: str
-    timestamp: float
-    data: Dict[str, Any] = None
+    """Event data structure, slotted since one is allocated per publish"""
     
-    def __post_init__(self):
-        if self.data is None:
-            self.data = {}
+    __slots__ = ('type', 'source', 'timestamp', 'data')
+    
+    def __init__(self, type: EventType, source: str, timestamp: float, data: Dict[str, Any] = None):
+        self.type = type
+        self.source = source
+        self.timestamp = timestamp
+        self.data = data if data is not None else {}
+    
+    def __repr__(self):
+        return (f"Event(type={self.type!r}, source={self.source!r}, "
+                f"timestamp={self.timestamp!r}, data={self.data!r})")
 
 
 class EventPublisher:
     """
     Publishes events to registered subscribers.
-    Central hub for application events.
+    Central hub for application events; use get_event_publisher() to get the
+    shared instance.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        """Singleton pattern to ensure only one event publisher exists"""
-        if cls._instance is None:
-            cls._instance = super(EventPublisher, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        """Initialize the event publisher if it hasn't been already"""
-        if self._initialized:
-            return
-            
+        """Initialize the event publisher"""
         self.logger = logging.getLogger('midi_calculator.events')
-        self.subscribers = {event_type: [] for event_type in EventType}
-        self.event_history = []
+        # Subscribers per event type, kept in an insertion-ordered dict for O(1)
+        # membership, plus a tuple snapshot of each that publish() iterates
+        self.subscribers = {event_type: {} for event_type in EventType}
+        self._subscriber_tuples = {event_type: () for event_type in EventType}
         self.max_history = 100
-        self._initialized = True
+        self.event_history = deque(maxlen=self.max_history)  # Oldest events drop off when full
         self.logger.info("EventPublisher initialized")
     
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
@@ -69,12 +65,11 @@ class EventPublisher:
             event_type: Type of event to subscribe to
             callback: Function to call when event is published
         """
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        
-        if callback not in self.subscribers[event_type]:
-            self.subscribers[event_type].append(callback)
-            self.logger.debug(f"Subscribed to {event_type.name}")
+        callbacks = self.subscribers.setdefault(event_type, {})
+        if callback not in callbacks:
+            callbacks[callback] = None
+            self._subscriber_tuples[event_type] = tuple(callbacks)
+            self.logger.debug("Subscribed to %s", event_type.name)
     
     def unsubscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """
@@ -84,9 +79,23 @@ class EventPublisher:
             event_type: Type of event to unsubscribe from
             callback: Function to remove from subscribers
         """
-        if event_type in self.subscribers and callback in self.subscribers[event_type]:
-            self.subscribers[event_type].remove(callback)
-            self.logger.debug(f"Unsubscribed from {event_type.name}")
+        callbacks = self.subscribers.get(event_type)
+        if callbacks is not None and callback in callbacks:
+            del callbacks[callback]
+            self._subscriber_tuples[event_type] = tuple(callbacks)
+            self.logger.debug("Unsubscribed from %s", event_type.name)
+    
+    def has_subscribers(self, event_type: EventType) -> bool:
+        """
+        Check whether anything is subscribed to an event type.
+        
+        Args:
+            event_type: Type of event to check
+            
+        Returns:
+            bool: True if at least one callback is subscribed
+        """
+        return bool(self._subscriber_tuples.get(event_type))
     
     def publish(self, event: Event) -> None:
         """
@@ -97,19 +106,17 @@ class EventPublisher:
         """
         # Add to history
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
         
-        # Log event
-        self.logger.debug(f"Event: {event.type.name} from {event.source}")
+        # Log event, skipping the attribute lookups when debug is off
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Event: %s from %s", event.type.name, event.source)
         
-        # Notify subscribers
-        if event.type in self.subscribers:
-            for callback in self.subscribers[event.type]:
-                try:
-                    callback(event)
-                except Exception as e:
-                    self.logger.error(f"Error in event subscriber: {str(e)}")
+        # Notify subscribers, iterating a snapshot so callbacks may (un)subscribe
+        for callback in self._subscriber_tuples.get(event.type, ()):
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("Error in event subscriber: %s", e)
     
     def create_and_publish(self, 
                           event_type: EventType, 
@@ -126,12 +133,7 @@ class EventPublisher:
         Returns:
             The created event
         """
-        event = Event(
-            type=event_type,
-            source=source,
-            timestamp=time.time(),
-            data=data or {}
-        )
+        event = Event(event_type, source, time.time(), data or {})
         self.publish(event)
         return event
     
@@ -146,7 +148,29 @@ class EventPublisher:
         Returns:
             List of events
         """
+        history = self.event_history
         if event_type:
-            filtered = [e for e in self.event_history if e.type == event_type]
-            return filtered[-count:]
-        return self.event_history[-count:]
+            # Walk back from the newest event, stopping once we have enough
+            matches = islice((e for e in reversed(history) if e.type == event_type), count)
+            return list(matches)[::-1]
+        return list(islice(history, max(0, len(history) - count), None))
+
+
+_default_publisher = None
+_default_publisher_lock = threading.Lock()
+
+
+def get_event_publisher() -> EventPublisher:
+    """
+    Get the application-wide event publisher, creating it on first use.
+    
+    Returns:
+        The shared EventPublisher
+    """
+    global _default_publisher
+    if _default_publisher is None:
+        # Checked again under the lock so racing first callers share one instance
+        with _default_publisher_lock:
+            if _default_publisher is None:
+                _default_publisher = EventPublisher()
+    return _default_publisher
@@ -1,10 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
-import mido
 from midi.scales import MidiScale
 from midi.device import MidiDevice
 from sequencer.sequencer import StepSequencer
-import threading
 
 
 class MidiDeviceGUI:
@@ -20,8 +18,11 @@ class MidiDeviceGUI:
         self.step_active = tk.BooleanVar(value=False)
         self.note_value = tk.StringVar(value="")
         self.pattern_length = tk.StringVar(value="16")
+        self._pattern_length_cached = 16
+        self.pattern_length.trace_add('write', self._on_pattern_length_write)
         self.playback_step_label = None
-        self.update_timer = None
+        self._last_shown_step = -1
+        self._step_poll = None  # Pending root.after() id while playing
         self.bpm_var = tk.StringVar(value="120")
         self.apply_to_pattern_var = tk.BooleanVar(value=False)
         self.note_chance_var = tk.DoubleVar(value=0.5)
@@ -30,12 +31,17 @@ class MidiDeviceGUI:
         self.setup_gui()
 
     def setup_gui(self):
+        # Build the widgets while the window is hidden so the initial layout
+        # is computed once instead of resizing as each frame is packed.
+        self.root.withdraw()
         self.setup_midi_controls()
         self.setup_note_player()
         self.setup_scale_controls()
         self.setup_timing_controls()
         self.setup_step_controls()
         self.setup_transport_controls()
+        self.root.update_idletasks()
+        self.root.deiconify()
 
     def setup_midi_controls(self):
         control_frame = tk.LabelFrame(self.root, text="MIDI Controls")
@@ -47,9 +53,13 @@ class MidiDeviceGUI:
 
         tk.Label(port_frame, text="Port:").pack(side=tk.LEFT)
         self.port_var = tk.StringVar(value=self.midi_device.midi_outputs[0])
-        tk.OptionMenu(port_frame, self.port_var,
-                      *self.midi_device.midi_outputs,
-                      command=self.change_port).pack(side=tk.LEFT)
+        self._port_index = {name: i for i, name in enumerate(self.midi_device.midi_outputs)}
+        self._port_menu = tk.OptionMenu(port_frame, self.port_var,
+                                        *self.midi_device.midi_outputs,
+                                        command=self.change_port)
+        self._port_menu.pack(side=tk.LEFT)
+        tk.Button(port_frame, text="Rescan",
+                  command=self.rescan_ports).pack(side=tk.LEFT, padx=5)
 
         # Channel selection
         channel_frame = tk.Frame(control_frame)
@@ -94,15 +104,12 @@ class MidiDeviceGUI:
         tk.Label(root_frame, text="Root:").pack(side=tk.LEFT)
         self.root_note_var = tk.StringVar(value="C")
         tk.OptionMenu(root_frame, self.root_note_var,
-                      *list(MidiScale.NOTE_TO_MIDI.keys())).pack(side=tk.LEFT)
+                      *MidiScale.NOTE_NAMES).pack(side=tk.LEFT)
 
         tk.Label(root_frame, text="Type:").pack(side=tk.LEFT)
         self.scale_type_var = tk.StringVar(value="MAJOR")
-        scale_types = [attr.replace('_INTERVALS', '')
-                       for attr in dir(MidiScale)
-                       if attr.endswith('_INTERVALS')]
         tk.OptionMenu(root_frame, self.scale_type_var,
-                      *scale_types).pack(side=tk.LEFT)
+                      *MidiScale.SCALE_TYPES).pack(side=tk.LEFT)
 
         octave_frame = tk.Frame(scale_frame)
         octave_frame.pack(fill="x", padx=5, pady=2)
@@ -214,9 +221,22 @@ class MidiDeviceGUI:
 
     # Method implementations from both classes
     def change_port(self, selection):
-        port_index = self.midi_device.midi_outputs.index(selection)
-        self.midi_device.outport.close()
-        self.midi_device.outport = mido.open_output(self.midi_device.midi_outputs[port_index])
+        port_index = self._port_index[selection]
+        self.midi_device.open_port(self.midi_device.midi_outputs[port_index])
+
+    def rescan_ports(self):
+        self.midi_device.rescan_ports()
+        self._refresh_port_menu()
+
+    def _refresh_port_menu(self):
+        """Replace the port menu's entries in place rather than rebuilding the widget"""
+        outputs = self.midi_device.midi_outputs
+        self._port_index = {name: i for i, name in enumerate(outputs)}
+        menu = self._port_menu['menu']
+        menu.delete(0, 'end')
+        for name in outputs:
+            menu.add_command(label=name,
+                             command=tk._setit(self.port_var, name, self.change_port))
 
     def play_note(self):
         try:
@@ -225,11 +245,7 @@ class MidiDeviceGUI:
             channel = self.current_channel.get()
 
             if 0 <= note <= 127 and duration > 0:
-                threading.Thread(
-                    target=self.midi_device.send_note,
-                    args=(note, duration, channel),
-                    daemon=True
-                ).start()
+                self.midi_device.send_note(note, duration, channel)
             else:
                 raise ValueError("Note must be 0-127 and duration must be positive")
         except ValueError as e:
@@ -278,30 +294,29 @@ class MidiDeviceGUI:
 
     def start_playback(self):
         self.sequencer.start()
-        self.start_playback_updates()
+        if self._step_poll is None:
+            self._step_poll = self.root.after(50, self._poll_playback_step)
 
     def stop_playback(self):
         """Stop both sequencer and scale playback"""
+        if self._step_poll is not None:
+            self.root.after_cancel(self._step_poll)
+            self._step_poll = None
         self.sequencer.stop()
         self.sequencer.stop_scale_playback()
-        self.stop_playback_updates()
-
-    def start_playback_updates(self):
-        if self.update_timer is None:
-            self.update_playback_display()
-
-    def stop_playback_updates(self):
-        if self.update_timer is not None:
-            self.root.after_cancel(self.update_timer)
-            self.update_timer = None
-            self.playback_step_label.config(text="Playing: --")
-
-    def update_playback_display(self):
-        if self.sequencer.running:
-            self.playback_step_label.config(text=f"Playing: {self.sequencer.playback_step + 1}")
-            self.update_timer = self.root.after(50, self.update_playback_display)
-        else:
-            self.stop_playback_updates()
+        self.playback_step_label.config(text="Playing: --")
+        self._last_shown_step = -1
+
+    def _poll_playback_step(self):
+        """Refresh the step label while playing; only the Tk thread touches Tk"""
+        self._step_poll = None
+        if not self.sequencer.running:
+            return
+        step = self.sequencer.playback_step
+        if step != self._last_shown_step:
+            self.playback_step_label.config(text=f"Playing: {step + 1}")
+            self._last_shown_step = step
+        self._step_poll = self.root.after(50, self._poll_playback_step)
 
     def change_channel(self):
         self.load_step_data()
@@ -316,14 +331,23 @@ class MidiDeviceGUI:
         except ValueError as e:
             tk.messagebox.showerror("Error", str(e))
 
+    def _on_pattern_length_write(self, *args):
+        """Refresh the cached pattern length when the entry holds a valid number"""
+        try:
+            length = int(self.pattern_length.get())
+        except ValueError:
+            return
+        if length > 0:
+            self._pattern_length_cached = length
+
     def prev_step(self):
         current = self.edit_step.get()
-        self.edit_step.set((current - 1) % int(self.pattern_length.get()))
+        self.edit_step.set((current - 1) % self._pattern_length_cached)
         self.load_step_data()
 
     def next_step(self):
         current = self.edit_step.get()
-        self.edit_step.set((current + 1) % int(self.pattern_length.get()))
+        self.edit_step.set((current + 1) % self._pattern_length_cached)
         self.load_step_data()
 
     def load_step_data(self):
@@ -332,8 +356,8 @@ class MidiDeviceGUI:
                 self.current_channel.get(),
                 self.edit_step.get()
             )
-            self.step_active.set(step_data['active'])
-            self.note_value.set(str(step_data['note']) if step_data['note'] is not None else "")
+            self.step_active.set(step_data.active)
+            self.note_value.set(str(step_data.note) if step_data.note is not None else "")
         except ValueError as e:
             tk.messagebox.showerror("Error", str(e))
 
@@ -3,9 +3,13 @@ from midi.device import MidiDevice
 from sequencer.sequencer import StepSequencer
 from display_controller import DisplayController
 import RPi.GPIO as GPIO
-import time
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import signal
+import threading
 
 def setup_logging():
     """Set up logging for the MIDI Calculator application"""
@@ -13,15 +17,26 @@ def setup_logging():
     if not os.path.exists('logs'):
         os.makedirs('logs')
     
+    # Log records are only queued by the calling thread; a listener thread
+    # does the formatting and file/console I/O, so the clock and display
+    # threads never block on a write
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    output_handlers = [
+        logging.FileHandler('logs/midi_calculator.log'),
+        logging.StreamHandler()
+    ]
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *output_handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/midi_calculator.log'),
-            logging.StreamHandler()
-        ]
-    )
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     # Create logger
     logger = logging.getLogger('midi_calculator')
@@ -32,6 +47,10 @@ def main():
     """Main application entry point"""
     logger = setup_logging()
     
+    # Set on SIGTERM; the main thread just sleeps on it until then
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+    
     try:
         logger.info("Initializing MIDI device")
         midi_device = MidiDevice(0)
@@ -44,13 +63,13 @@ def main():
         
         # Main application loop
         logger.info("Entering main loop")
-        while True:
-            time.sleep(0.1)  # Small sleep to prevent CPU hogging
+        shutdown.wait()
             
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}", exc_info=True)
     finally:
         logger.info("Shutting down")
+        shutdown.set()
         
         # Clean up resources
         if 'display' in locals():
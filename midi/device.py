@@ -1,4 +1,8 @@
+import heapq
+import itertools
+import logging
 import mido
+import threading
 import time
 
 
@@ -12,6 +16,17 @@ class MidiDevice:
 
         self.outport = mido.open_output(self.midi_outputs[output_num])
         self.channel = 0
+        self.logger = logging.getLogger('midi_calculator.midi')
+
+        # Messages waiting to be sent, as (due time, sequence, message) on a heap
+        self._pending = []
+        self._pending_cond = threading.Condition()
+        self._sequence = itertools.count()
+        self._closed = False
+        # Ports switched away from with keep_previous, by name, for reuse
+        self._idle_ports = {}
+        self._sender = threading.Thread(target=self._send_scheduled, daemon=True)
+        self._sender.start()
 
     def send_note(self, note: int, duration: float, channel: int, velocity: int = 100):
         if not 0 <= note <= 127:
@@ -21,12 +36,62 @@ class MidiDevice:
                                channel=channel, time=duration)
         note_off = mido.Message('note_off', note=note, velocity=velocity,
                                 channel=channel, time=duration)
-        print("send note: ", note)
-        print("channel:", channel)
-        print("outport:", self.outport)
-        self.outport.send(note_on)
-        time.sleep(duration)
-        self.outport.send(note_off)
+        now = time.monotonic()
+        self._schedule(now, note_on)
+        self._schedule(now + duration, note_off)
+
+    def _schedule(self, due: float, message):
+        """Queue a message for the sender thread to send at the monotonic time `due`"""
+        with self._pending_cond:
+            heapq.heappush(self._pending, (due, next(self._sequence), message))
+            self._pending_cond.notify()
+
+    def _send_scheduled(self):
+        """Send queued messages as they fall due, so callers never wait on a note"""
+        with self._pending_cond:
+            while not self._closed:
+                if not self._pending:
+                    self._pending_cond.wait()
+                    continue
+                delay = self._pending[0][0] - time.monotonic()
+                if delay > 0:
+                    # Woken early if a sooner message is queued
+                    self._pending_cond.wait(delay)
+                    continue
+                _, _, message = heapq.heappop(self._pending)
+                try:
+                    self.outport.send(message)
+                except Exception as e:
+                    # A closed or unplugged port mustn't take the sender down with it
+                    self.logger.warning("Failed to send %s: %s", message, e)
+
+    def open_port(self, name: str, keep_previous: bool = False):
+        """
+        Switch the output to the named port.
+
+        The swap happens under the sender's lock, so the old port is never
+        closed in the middle of a send. Does nothing if `name` is already open.
+
+        Args:
+            name: Name of the output port to switch to
+            keep_previous: Leave the old port open so switching back to it is
+                instant; close() closes it with the rest
+        """
+        with self._pending_cond:
+            old_name = getattr(self.outport, 'name', None)
+            if old_name == name:
+                return
+            new_port = self._idle_ports.pop(name, None) or mido.open_output(name)
+            old_port, self.outport = self.outport, new_port
+            if keep_previous:
+                self._idle_ports[old_name] = old_port
+            else:
+                old_port.close()
+
+    def rescan_ports(self):
+        """Re-enumerate the MIDI output ports; the names are cached otherwise"""
+        self.midi_outputs = mido.get_output_names()
+        return self.midi_outputs
 
     def set_channel(self, channel: int):
         if not 0 <= channel <= 15:
@@ -34,4 +99,17 @@ class MidiDevice:
         self.channel = channel
 
     def close(self):
-        self.outport.close()
\ No newline at end of file
+        with self._pending_cond:
+            self._closed = True
+            pending = sorted(self._pending)
+            self._pending.clear()
+            self._pending_cond.notify()
+        self._sender.join()
+        # Don't leave notes hanging on the synth
+        for _, _, message in pending:
+            if message.type == 'note_off':
+                self.outport.send(message)
+        self.outport.close()
+        for port in self._idle_ports.values():
+            port.close()
+        self._idle_ports.clear()
\ No newline at end of file
@@ -1,10 +1,18 @@
 # midi/clock.py
+import os
+import sys
 import time
 import threading
 import mido
 import logging
+from collections import deque
+from fractions import Fraction
 from typing import Callable, Optional
-from events.event_publisher import EventPublisher, EventType, Event
+from events.event_publisher import EventType, Event, get_event_publisher
+
+
+def _no_callback() -> None:
+    """Stand-in dispatch target while no callback is set"""
 
 
 class MidiClock:
@@ -24,29 +32,51 @@ class MidiClock:
         """
         self.midi_device = midi_device
         self.logger = logging.getLogger('midi_calculator.clock')
-        self.event_publisher = EventPublisher()
+        self.event_publisher = get_event_publisher()
         
         # Clock state
         self.is_master = True        # Whether we're generating or following clock
         self.running = False         # Whether clock is running
         self.tempo = 120.0           # BPM
         self.pulse_count = 0         # Counter for clock pulses
-        self.last_pulse_time = 0     # Time of last pulse
+        self._pulse_in_beat = 0      # Pulses since the last beat
+        self._pulse_in_sixteenth = 0 # Pulses since the last 16th note
+        self.last_pulse_time = 0     # perf_counter time of last pulse, in ns
         self.ppqn = self.PPQN        # Pulses per quarter note
         
         # Sync state
         self.pulse_interval = 60.0 / (self.tempo * self.ppqn)  # Time between pulses
+        self._set_pulse_interval_ns()
         self.sync_drift = 0.0        # Timing drift when slaved
         self.sync_source = None      # MIDI port providing sync
         
         # Thread control
         self.clock_thread = None
+        self.sender_thread = None
         self.stop_flag = threading.Event()
+        self._timer_period_raised = False  # timeBeginPeriod(1) active (Windows)
+        
+        # Pulses computed ahead of time as (deadline, message), sent by the
+        # sender thread exactly at their deadline
+        self.lookahead = 0.02        # seconds of pulses to keep queued
+        self._send_queue = deque()
+        self._send_cond = threading.Condition()
         
         # Callbacks
         self.on_pulse = None
         self.on_beat = None
         self.on_bar = None
+        # What the pulse path actually calls; swapped by the setters so the
+        # hot path never tests whether a callback is set
+        self._dispatch_pulse = _no_callback
+        self._dispatch_beat = _no_callback
+        self._dispatch_bar = _no_callback
+        
+        # Real-time messages never change, so build them once and reuse them
+        self._clock_msg = mido.Message('clock')
+        self._start_msg = mido.Message('start')
+        self._stop_msg = mido.Message('stop')
+        self._continue_msg = mido.Message('continue')
         
         # Beat/bar counting
         self.beats_per_bar = 4
@@ -64,6 +94,10 @@ class MidiClock:
         if self.is_master:
             # Master mode - generate clock
             self.logger.info("Starting MIDI clock as master")
+            self._raise_timer_resolution()
+            self.sender_thread = threading.Thread(target=self._run_sender)
+            self.sender_thread.daemon = True
+            self.sender_thread.start()
             self.clock_thread = threading.Thread(target=self._run_master_clock)
             self.clock_thread.daemon = True
             self.clock_thread.start()
@@ -80,13 +114,26 @@ class MidiClock:
         self.logger.info("Stopping MIDI clock")
         self.running = False
         self.stop_flag.set()
+        with self._send_cond:
+            self._send_cond.notify()
         
         if self.clock_thread:
             self.clock_thread.join(timeout=1.0)
             self.clock_thread = None
+        if self.sender_thread:
+            self.sender_thread.join(timeout=1.0)
+            self.sender_thread = None
+        self._restore_timer_resolution()
+        
+        # Drop pulses that were queued ahead and tell followers we've stopped
+        if self.is_master:
+            self._send_queue.clear()
+            self.send_stop()
             
         # Reset counters
         self.pulse_count = 0
+        self._pulse_in_beat = 0
+        self._pulse_in_sixteenth = 0
         self.current_beat = 0
         self.current_bar = 0
     
@@ -103,6 +150,7 @@ class MidiClock:
             
         self.tempo = bpm
         self.pulse_interval = 60.0 / (self.tempo * self.ppqn)
+        self._set_pulse_interval_ns()
         self.logger.info(f"Tempo set to {bpm} BPM")
         
         # Publish event
@@ -112,6 +160,14 @@ class MidiClock:
             {"tempo": bpm, "source": "internal"}
         )
     
+    def _set_pulse_interval_ns(self) -> None:
+        """Store the master pulse interval as exact whole and fractional nanoseconds"""
+        tempo = Fraction(self.tempo).limit_denominator(1000)
+        interval = Fraction(60_000_000_000) / (tempo * self.ppqn)
+        whole, remainder = divmod(interval.numerator, interval.denominator)
+        # One tuple so the clock thread never sees a half-updated interval
+        self._pulse_interval_ns = (whole, remainder, interval.denominator)
+    
     def set_master(self, is_master: bool) -> None:
         """
         Set whether we're master or slave.
@@ -168,6 +224,7 @@ class MidiClock:
             callback: Function to call on each beat
         """
         self.on_beat = callback
+        self._dispatch_beat = callback or _no_callback
     
     def set_bar_callback(self, callback: Callable[[], None]) -> None:
         """
@@ -177,6 +234,7 @@ class MidiClock:
             callback: Function to call on each bar
         """
         self.on_bar = callback
+        self._dispatch_bar = callback or _no_callback
     
     def set_pulse_callback(self, callback: Callable[[], None]) -> None:
         """
@@ -186,27 +244,77 @@ class MidiClock:
             callback: Function to call on each pulse
         """
         self.on_pulse = callback
+        self._dispatch_pulse = callback or _no_callback
     
     def send_start(self) -> None:
         """Send MIDI start message and reset counters"""
         if self.is_master and self.midi_device:
-            self.midi_device.outport.send(mido.Message('start'))
+            self.midi_device.outport.send(self._start_msg)
             self.logger.debug("Sent MIDI start")
     
     def send_stop(self) -> None:
         """Send MIDI stop message"""
         if self.is_master and self.midi_device:
-            self.midi_device.outport.send(mido.Message('stop'))
+            self.midi_device.outport.send(self._stop_msg)
             self.logger.debug("Sent MIDI stop")
     
     def send_continue(self) -> None:
         """Send MIDI continue message"""
         if self.is_master and self.midi_device:
-            self.midi_device.outport.send(mido.Message('continue'))
+            self.midi_device.outport.send(self._continue_msg)
             self.logger.debug("Sent MIDI continue")
     
+    def _raise_timer_resolution(self) -> None:
+        """On Windows, ask for 1 ms timer ticks so waits don't round up to ~15.6 ms"""
+        if sys.platform != 'win32' or self._timer_period_raised:
+            return
+        import ctypes
+        self._timer_period_raised = ctypes.windll.winmm.timeBeginPeriod(1) == 0
+    
+    def _restore_timer_resolution(self) -> None:
+        """Undo _raise_timer_resolution"""
+        if not self._timer_period_raised:
+            return
+        import ctypes
+        ctypes.windll.winmm.timeEndPeriod(1)
+        self._timer_period_raised = False
+    
+    def _raise_priority(self) -> None:
+        """Best effort: move the calling thread to the real-time FIFO scheduler"""
+        if not hasattr(os, 'sched_setscheduler'):
+            return
+        try:
+            priority = os.sched_get_priority_min(os.SCHED_FIFO)
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except OSError as e:
+            self.logger.debug(f"Clock sender stays at normal priority: {e}")
+    
+    def _run_sender(self) -> None:
+        """Send queued clock messages at their deadlines; the only time-critical thread"""
+        self._raise_priority()
+        send_queue = self._send_queue
+        send_cond = self._send_cond
+        
+        while True:
+            with send_cond:
+                while not send_queue and self.running:
+                    send_cond.wait()
+                if not self.running:
+                    return
+                deadline, message = send_queue.popleft()
+            
+            # Sleep until just before the deadline, then spin the last stretch
+            delay_ns = deadline - time.perf_counter_ns()
+            if delay_ns > 1_000_000 and self.stop_flag.wait((delay_ns - 500_000) / 1e9):
+                return
+            while time.perf_counter_ns() < deadline:
+                pass
+            
+            if self.midi_device:
+                self.midi_device.outport.send(message)
+    
     def _run_master_clock(self) -> None:
-        """Master clock main loop"""
+        """Master clock main loop: queues pulses ahead of time and does the bookkeeping"""
         self.logger.debug("Master clock thread started")
         
         # Send initial messages
@@ -214,32 +322,44 @@ class MidiClock:
         
         # Reset counters
         self.pulse_count = 0
+        self._pulse_in_beat = 0
+        self._pulse_in_sixteenth = 0
         self.current_beat = 0
         self.current_bar = 0
         
-        last_time = time.time()
+        # Pulses are due on a fixed grid of absolute deadlines in integer
+        # nanoseconds, so lateness in one pulse doesn't push back every pulse
+        # after it. The fractional part of the interval is carried Bresenham
+        # style, so the grid never drifts from the exact tempo.
+        lookahead_ns = int(self.lookahead * 1e9)
+        interval_ns, _, _ = self._pulse_interval_ns
+        next_deadline = time.perf_counter_ns() + interval_ns
+        fraction = 0
         
         while self.running and not self.stop_flag.is_set():
-            current_time = time.time()
-            elapsed = current_time - last_time
+            # Wait until the next pulse enters the lookahead window
+            delay_ns = next_deadline - lookahead_ns - time.perf_counter_ns()
+            if delay_ns > 0:
+                if self.stop_flag.wait(delay_ns / 1e9):
+                    break
+                continue
+            
+            # Queue clock pulse for the sender thread
+            with self._send_cond:
+                self._send_queue.append((next_deadline, self._clock_msg))
+                self._send_cond.notify()
+            
+            # Handle pulse
+            self._handle_pulse()
             
-            if elapsed >= self.pulse_interval:
-                # Send clock pulse
-                if self.midi_device:
-                    self.midi_device.outport.send(mido.Message('clock'))
-                
-                # Handle pulse
-                self._handle_pulse()
-                
-                # Update timing
-                last_time = current_time
-                
-                # Sleep for a fraction of the interval to reduce CPU usage
-                # but still maintain accuracy
-                time.sleep(self.pulse_interval * 0.2)
-            else:
-                # Sleep a small amount to reduce CPU usage
-                time.sleep(0.001)
+            # Advance the grid; if we fell more than a pulse behind (e.g. the
+            # process was suspended), restart it from now rather than bursting
+            interval_ns, remainder, denominator = self._pulse_interval_ns
+            carry, fraction = divmod(fraction + remainder, denominator)
+            next_deadline += interval_ns + carry
+            now = time.perf_counter_ns()
+            if now - next_deadline > interval_ns:
+                next_deadline = now + interval_ns
     
     def _start_slave_clock(self) -> None:
         """Set up slave clock listener"""
@@ -274,6 +394,8 @@ class MidiClock:
         elif message.type == 'start':
             # Reset counters
             self.pulse_count = 0
+            self._pulse_in_beat = 0
+            self._pulse_in_sixteenth = 0
             self.current_beat = 0
             self.current_bar = 0
             self.logger.debug("Received MIDI start")
@@ -297,10 +419,10 @@ class MidiClock:
     def _handle_pulse(self) -> None:
         """Handle a single clock pulse and update counters"""
         # Calculate tempo if in slave mode
-        current_time = time.time()
+        current_time = time.perf_counter_ns()
         if self.last_pulse_time > 0:
             # Update timing info
-            pulse_time = current_time - self.last_pulse_time
+            pulse_time = (current_time - self.last_pulse_time) / 1e9
             
             if not self.is_master:
                 # Estimate tempo from pulse timing
@@ -315,26 +437,32 @@ class MidiClock:
         # Increment pulse counter
         self.pulse_count += 1
         
-        # Check for beat
-        if self.pulse_count % self.ppqn == 0:
+        # Check for beat; small wrapping counters instead of a modulo on the
+        # ever-growing pulse_count
+        self._pulse_in_beat += 1
+        if self._pulse_in_beat >= self.ppqn:
+            self._pulse_in_beat = 0
             self._handle_beat()
         
-        # Call pulse callback if set
-        if self.on_pulse:
-            self.on_pulse()
+        # Call pulse callback
+        self._dispatch_pulse()
             
-        # Publish pulse event every 6 pulses (16th note) to reduce overhead
-        if self.pulse_count % 6 == 0:
-            self.event_publisher.create_and_publish(
-                EventType.MIDI_CLOCK,
-                "clock",
-                {
-                    "pulse": self.pulse_count,
-                    "tempo": self.tempo,
-                    "beat": self.current_beat,
-                    "bar": self.current_bar
-                }
-            )
+        # Publish pulse event every 6 pulses (16th note) to reduce overhead,
+        # and not at all when nobody is listening
+        self._pulse_in_sixteenth += 1
+        if self._pulse_in_sixteenth >= 6:
+            self._pulse_in_sixteenth = 0
+            if self.event_publisher.has_subscribers(EventType.MIDI_CLOCK):
+                self.event_publisher.create_and_publish(
+                    EventType.MIDI_CLOCK,
+                    "clock",
+                    {
+                        "pulse": self.pulse_count,
+                        "tempo": self.tempo,
+                        "beat": self.current_beat,
+                        "bar": self.current_bar
+                    }
+                )
     
     def _handle_beat(self) -> None:
         """Handle beat completion and update counters"""
@@ -346,24 +474,17 @@ class MidiClock:
             self.current_beat = 0
             self.current_bar += 1
             
-            # Call bar callback if set
-            if self.on_bar:
-                self.on_bar()
-                
-            # Publish bar event
+            # Call bar callback
+            self._dispatch_bar()
+        
+        # Call beat callback
+        self._dispatch_beat()
+            
+        # Publish one beat event, which also carries the new bar number when
+        # a bar starts (beat 0)
+        if self.event_publisher.has_subscribers(EventType.MIDI_CLOCK):
             self.event_publisher.create_and_publish(
                 EventType.MIDI_CLOCK,
                 "clock",
-                {"bar": self.current_bar}
+                {"beat": self.current_beat, "bar": self.current_bar}
             )
-        
-        # Call beat callback if set
-        if self.on_beat:
-            self.on_beat()
-            
-        # Publish beat event
-        self.event_publisher.create_and_publish(
-            EventType.MIDI_CLOCK,
-            "clock",
-            {"beat": self.current_beat, "bar": self.current_bar}
-        )
@@ -1,4 +1,6 @@
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 
 
@@ -8,42 +10,62 @@ class MidiScale:
         "D#": 27, "E": 28, "F": 29, "F#": 30, "G": 31, "G#": 32
     }
 
-    MAJOR_INTERVALS = [0, 2, 4, 5, 7, 9, 11]
-    MINOR_INTERVALS = [0, 2, 3, 5, 7, 8, 10]
-    DORIAN_INTERVALS = [0, 2, 3, 5, 7, 9, 10]
-    PHRYGIAN_INTERVALS = [0, 1, 3, 5, 7, 8, 10]
-    LYDIAN_INTERVALS = [0, 2, 4, 6, 7, 9, 11]
-    MIXOLYDIAN_INTERVALS = [0, 2, 4, 5, 7, 9, 10]
-    LOCRIAN_INTERVALS = [0, 1, 3, 5, 6, 8, 10]
-    HARMONIC_MINOR_INTERVALS = [0, 2, 3, 5, 7, 8, 11]
-    MELODIC_MINOR_INTERVALS = [0, 2, 3, 5, 7, 9, 11]
-    WHOLE_TONE_INTERVALS = [0, 2, 4, 6, 8, 10]
-    CHROMATIC_INTERVALS = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
-    PENTATONIC_MAJOR_INTERVALS = [0, 2, 4, 7, 9]
-    PENTATONIC_MINOR_INTERVALS = [0, 3, 5, 7, 10]
-    BLUES_INTERVALS = [0, 3, 5, 6, 7, 10]
-    DIMINISHED_INTERVALS = [0, 2, 3, 5, 6, 8, 9, 11]
+    MAJOR_INTERVALS = (0, 2, 4, 5, 7, 9, 11)
+    MINOR_INTERVALS = (0, 2, 3, 5, 7, 8, 10)
+    DORIAN_INTERVALS = (0, 2, 3, 5, 7, 9, 10)
+    PHRYGIAN_INTERVALS = (0, 1, 3, 5, 7, 8, 10)
+    LYDIAN_INTERVALS = (0, 2, 4, 6, 7, 9, 11)
+    MIXOLYDIAN_INTERVALS = (0, 2, 4, 5, 7, 9, 10)
+    LOCRIAN_INTERVALS = (0, 1, 3, 5, 6, 8, 10)
+    HARMONIC_MINOR_INTERVALS = (0, 2, 3, 5, 7, 8, 11)
+    MELODIC_MINOR_INTERVALS = (0, 2, 3, 5, 7, 9, 11)
+    WHOLE_TONE_INTERVALS = (0, 2, 4, 6, 8, 10)
+    CHROMATIC_INTERVALS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+    PENTATONIC_MAJOR_INTERVALS = (0, 2, 4, 7, 9)
+    PENTATONIC_MINOR_INTERVALS = (0, 3, 5, 7, 10)
+    BLUES_INTERVALS = (0, 3, 5, 6, 7, 10)
+    DIMINISHED_INTERVALS = (0, 2, 3, 5, 6, 8, 9, 11)
+
+    # Valid root notes, and scale type names in dir() (alphabetical) order
+    NOTE_NAMES = tuple(NOTE_TO_MIDI)
+    SCALE_TYPES = tuple(attr[:-len('_INTERVALS')] for attr in dir() if attr.endswith('_INTERVALS'))
+    # Scale type name -> intervals, so generate_scale does a single dict lookup
+    _INTERVAL_MAP = {attr[:-len('_INTERVALS')]: intervals
+                     for attr, intervals in list(vars().items()) if attr.endswith('_INTERVALS')}
 
     @classmethod
     def generate_scale(cls, root_note: str, scale_type: str,
-                       start_octave: int = 0, end_octave: int = 10) -> Dict[int, List[int]]:
+                       start_octave: int = 0, end_octave: int = 10) -> Mapping[int, Tuple[int, ...]]:
+        # Scales are memoized and shared between callers, so they're returned as a
+        # read-only MappingProxyType of octave -> note tuple; take dict(scale) for
+        # a mutable copy
+        return cls._generate_scale_cached(root_note, scale_type, start_octave, end_octave)
+
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _generate_scale_cached(cls, root_note: str, scale_type: str,
+                               start_octave: int, end_octave: int) -> Mapping[int, Tuple[int, ...]]:
         if root_note not in cls.NOTE_TO_MIDI:
             raise ValueError(f"Invalid root note '{root_note}'. Choose from {list(cls.NOTE_TO_MIDI.keys())}.")
 
         base_midi = cls.NOTE_TO_MIDI[root_note]
-        interval_attr = f"{scale_type.upper()}_INTERVALS"
-
-        if hasattr(cls, interval_attr):
-            intervals = getattr(cls, interval_attr)
-        else:
-            raise ValueError(f"Unknown scale type: {scale_type}")
+        try:
+            intervals = cls._INTERVAL_MAP[scale_type.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown scale type: {scale_type}") from None
 
+        # Intervals ascend from 0, so an octave whose root and top note are in
+        # MIDI range is complete and needs no per-note bounds check
+        top_interval = intervals[-1]
         scale = {}
         for octave in range(start_octave, end_octave + 1):
             base_note = base_midi + (octave * 12)
-            notes = [base_note + interval for interval in intervals
-                     if 0 <= base_note + interval <= 127]
+            if base_note >= 0 and base_note + top_interval <= 127:
+                scale[octave] = tuple(base_note + interval for interval in intervals)
+                continue
+            notes = tuple(base_note + interval for interval in intervals
+                          if 0 <= base_note + interval <= 127)
             if notes:
                 scale[octave] = notes
 
-        return scale
\ No newline at end of file
+        return MappingProxyType(scale)
\ No newline at end of file
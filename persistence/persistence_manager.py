@@ -1,9 +1,121 @@
 # persistence/persistence_manager.py
-import json
+import heapq
+import itertools
 import os
 import logging
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Mapping, Optional
+
+
+def _encode_default(obj: Any) -> Any:
+    """Serialize mappings that aren't dicts, e.g. read-only scales from MidiScale.generate_scale"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        # Non-str keys (e.g. step numbers) become strings, as with json.dumps
+        return orjson.dumps(obj, default=_encode_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_encode_default)
+except ImportError:  # orjson is optional, fall back to stdlib json
+    import json
+
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=_encode_default).encode()
+
+    def _dumps_line(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), default=_encode_default).encode()
+
+# Version written in the header line of saved files
+FORMAT_VERSION = '1.1'
+
+
+class _SchedulerThread:
+    """
+    Runs periodic jobs from one daemon thread, sleeping until the
+    earliest job is due instead of polling.
+    """
+    
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        # Jobs as (due time, job id, interval, callback) on a heap
+        self._jobs = []
+        self._cond = threading.Condition()
+        self._job_ids = itertools.count()
+        self._closed = False
+        self._thread = None
+    
+    def schedule(self, interval: float, callback: Callable[[], Any]) -> int:
+        """
+        Run callback every interval seconds, first after one interval.
+        
+        Args:
+            interval: Seconds between runs
+            callback: Function to call
+            
+        Returns:
+            int: Job id for cancel()
+        """
+        with self._cond:
+            job_id = next(self._job_ids)
+            heapq.heappush(self._jobs, (time.monotonic() + interval, job_id, interval, callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            # Woken early in case this job is due before the one being waited on
+            self._cond.notify()
+        return job_id
+    
+    def cancel(self, job_id: int) -> None:
+        """Stop a scheduled job"""
+        with self._cond:
+            self._jobs = [job for job in self._jobs if job[1] != job_id]
+            heapq.heapify(self._jobs)
+    
+    def close(self) -> None:
+        """Stop the scheduler thread; pending jobs are dropped"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._jobs:
+                        self._cond.wait()
+                        continue
+                    delay = self._jobs[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                due, job_id, interval, callback = self._jobs[0]
+                heapq.heapreplace(self._jobs, (due + interval, job_id, interval, callback))
+            
+            # Run the job outside the lock so it can schedule or cancel jobs
+            try:
+                callback()
+            except Exception:
+                self.logger.exception("Scheduled job %r failed", callback)
 
 
 class PersistenceManager:
@@ -21,11 +133,22 @@ class PersistenceManager:
         """
         self.data_directory = data_directory
         self.logger = logging.getLogger('midi_calculator.persistence')
+        self._scheduler = _SchedulerThread(self.logger)
+        self._auto_save_job = None
+        
+        # Directory of each category, and the same with a trailing separator
+        # so file paths are a plain concatenation
+        self._category_dirs = {
+            category: os.path.join(data_directory, category)
+            for category in ('patterns', 'scales', 'state')
+        }
+        self._category_prefixes = {
+            category: dir_path + os.sep for category, dir_path in self._category_dirs.items()
+        }
         
         # Create directories if they don't exist
-        os.makedirs(os.path.join(data_directory, 'patterns'), exist_ok=True)
-        os.makedirs(os.path.join(data_directory, 'scales'), exist_ok=True)
-        os.makedirs(os.path.join(data_directory, 'state'), exist_ok=True)
+        for dir_path in self._category_dirs.values():
+            os.makedirs(dir_path, exist_ok=True)
     
     def save_pattern(self, name: str, pattern_data: Dict) -> bool:
         """
@@ -38,7 +161,7 @@ class PersistenceManager:
         Returns:
             bool: True if pattern was saved successfully, False otherwise
         """
-        return self._save_data('patterns', name, pattern_data)
+        return self._save_data('patterns', name, pattern_data, durable=True)
     
     def load_pattern(self, name: str) -> Optional[Dict]:
         """
@@ -72,7 +195,7 @@ class PersistenceManager:
         Returns:
             bool: True if scale was saved successfully, False otherwise
         """
-        return self._save_data('scales', name, scale_data)
+        return self._save_data('scales', name, scale_data, durable=True)
     
     def load_scale(self, name: str) -> Optional[Dict]:
         """
@@ -137,42 +260,68 @@ class PersistenceManager:
         Args:
             interval: Time between auto-saves in seconds (default: 5 minutes)
         """
-        # This would normally be implemented as a separate thread
-        # or scheduled task, but for simplicity we'll just define the interface
-        self.logger.info(f"Auto-save would be enabled with {interval}s interval")
+        if self._auto_save_job is not None:
+            self._scheduler.cancel(self._auto_save_job)
+        self._auto_save_job = self._scheduler.schedule(interval, self.save_state)
+        self.logger.info("Auto-save enabled with %ss interval", interval)
+    
+    def stop_auto_save(self) -> None:
+        """Stop automatic state saving"""
+        if self._auto_save_job is not None:
+            self._scheduler.cancel(self._auto_save_job)
+            self._auto_save_job = None
+            self.logger.info("Auto-save disabled")
+    
+    def close(self) -> None:
+        """Stop auto-saving and the background scheduler thread"""
+        self._auto_save_job = None
+        self._scheduler.close()
     
-    def _save_data(self, category: str, name: str, data: Dict) -> bool:
+    def _save_data(self, category: str, name: str, data: Dict, durable: bool = False) -> bool:
         """
         Save data to a JSON file.
         
+        The file holds a one-line metadata header (name, created, version)
+        followed by the data itself. It is written under a temporary name
+        and renamed over the target, so a crash mid-write never leaves a
+        truncated file behind.
+        
         Args:
             category: Data category (patterns, scales, state)
             name: Data name
             data: Data dictionary
+            durable: Also fsync the file before renaming it, for saves the
+                user asked for explicitly
             
         Returns:
             bool: True if data was saved successfully, False otherwise
         """
         try:
-            file_path = os.path.join(self.data_directory, category, f"{name}.json")
-            
-            # Add metadata
-            data_with_meta = {
-                'metadata': {
-                    'name': name,
-                    'created': time.time(),
-                    'version': '1.0'
-                },
-                'data': data
+            file_path = self._category_prefixes[category] + name + '.json'
+            
+            header = {
+                'name': name,
+                'created': time.time(),
+                'version': FORMAT_VERSION
             }
             
-            with open(file_path, 'w') as f:
-                json.dump(data_with_meta, f, indent=2)
+            tmp_path = f"{file_path}.tmp.{os.getpid()}"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(_dumps_line(header) + b'\n' + _dumps(data))
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             
-            self.logger.info(f"Saved {category}/{name}")
+            self.logger.info("Saved %s/%s", category, name)
             return True
         except Exception as e:
-            self.logger.error(f"Error saving {category}/{name}: {str(e)}")
+            self.logger.error("Error saving %s/%s: %s", category, name, e)
             return False
     
     def _load_data(self, category: str, name: str) -> Optional[Dict]:
@@ -189,25 +338,38 @@ class PersistenceManager:
         try:
             # Strip extension if provided
             name = name.replace('.json', '')
-            file_path = os.path.join(self.data_directory, category, f"{name}.json")
+            file_path = self._category_prefixes[category] + name + '.json'
             
             if not os.path.exists(file_path):
-                self.logger.warning(f"{category}/{name} not found")
+                self.logger.warning("%s/%s not found", category, name)
                 return None
             
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            
+            # Current format: metadata header line, then the data
+            header_line, _, body = raw.partition(b'\n')
+            if body.strip():
+                try:
+                    header = _loads(header_line)
+                except ValueError:
+                    header = None
+                if isinstance(header, dict) and 'version' in header:
+                    self.logger.info("Loaded %s/%s", category, name)
+                    return _loads(body)
+            
+            data = _loads(raw)
             
-            # Return just the data portion, not the metadata
+            # Version 1.0 format: {'metadata': ..., 'data': ...}
             if 'data' in data:
-                self.logger.info(f"Loaded {category}/{name}")
+                self.logger.info("Loaded %s/%s", category, name)
                 return data['data']
             else:
                 # Legacy format support
-                self.logger.info(f"Loaded {category}/{name} (legacy format)")
+                self.logger.info("Loaded %s/%s (legacy format)", category, name)
                 return data
         except Exception as e:
-            self.logger.error(f"Error loading {category}/{name}: {str(e)}")
+            self.logger.error("Error loading %s/%s: %s", category, name, e)
             return None
     
     def _list_files(self, category: str) -> List[str]:
@@ -221,10 +383,9 @@ class PersistenceManager:
             List of file names without extension
         """
         try:
-            dir_path = os.path.join(self.data_directory, category)
-            files = [f.replace('.json', '') for f in os.listdir(dir_path) 
-                    if f.endswith('.json')]
-            return sorted(files)
+            with os.scandir(self._category_dirs[category]) as entries:
+                return sorted(entry.name[:-len('.json')] for entry in entries
+                              if entry.name.endswith('.json') and entry.is_file())
         except Exception as e:
-            self.logger.error(f"Error listing {category}: {str(e)}")
+            self.logger.error("Error listing %s: %s", category, e)
             return []
@@ -1,4 +1,4 @@
-from .sequencer import StepSequencer
+from .sequencer import StepSequencer, StepView
 
 
-__all__ = ['StepSequencer']
\ No newline at end of file
+__all__ = ['StepSequencer', 'StepView']
\ No newline at end of file
@@ -1,6 +1,13 @@
 import threading
 import random
 import time
+from array import array
+from collections import namedtuple
+
+NO_NOTE = -1  # step_note value for a step without a note
+
+# Read-only snapshot of one step, as returned by StepSequencer.get_step
+StepView = namedtuple('StepView', 'active note velocity')
 
 
 class StepSequencer:
@@ -15,21 +22,39 @@ class StepSequencer:
         self.edit_step = 0  # Current step being edited
         self.event = threading.Event()
 
-        # Multi-channel pattern storage
-        # Format: {channel: {step: {'active': bool, 'note': int, 'velocity': int}}}
-        self.patterns = {}
-        for channel in range(16):  # MIDI has 16 channels
-            self.patterns[channel] = {
-                step: {
-                    'active': False,
-                    'note': None,
-                    'velocity': 100
-                } for step in range(max_steps)
-            }
+        # Cleared rows, built once and copied from whenever a channel is reset
+        self._empty_active = bytes(max_steps)
+        self._empty_note = array('b', [NO_NOTE]) * max_steps
+        self._empty_velocity = array('B', [100]) * max_steps
+
+        # Multi-channel pattern storage, one packed row per field and channel
+        # (MIDI has 16 channels), indexed as field[channel][step]:
+        # step_active 0/1 bytes, step_note signed bytes (NO_NOTE when unset)
+        # and step_velocity unsigned bytes
+        self.step_active = [bytearray(self._empty_active) for _ in range(16)]
+        self.step_note = [self._empty_note[:] for _ in range(16)]
+        self.step_velocity = [self._empty_velocity[:] for _ in range(16)]
         self.channel_lengths = {channel: steps_per_bar for channel in range(16)}
 
+        # Guards the pattern rows, so play_step never reads a half-written
+        # step or channel; held only for the copy, never while sending MIDI
+        self._lock = threading.Lock()
+
+        # Per step, the channels with a note to play, as (pattern version, channels).
+        # Pattern writers bump _pattern_version after writing, which
+        # invalidates every entry; play_step rebuilds them lazily.
+        self._pattern_version = 0
+        self._active_channels = [(-1, ())] * max_steps
+
         self.current_scale = None
         self.current_octave = 3  # Default octave
+        # current_scale's octaves and {octave: notes}, as tuples for random.choice
+        self._scale_octaves = ()
+        self._scale_notes = {}
+        # Last scale passed in and its (octaves, notes by octave); generated
+        # scales are memoized, so the same object comes back for a repeat
+        self._last_scale = None
+        self._last_scale_layout = None
         self.scale_playback = False
         self.scale_thread = None
 
@@ -44,33 +69,39 @@ class StepSequencer:
         if not (0 <= velocity <= 127):
             raise ValueError("Velocity must be between 0 and 127")
 
-        self.patterns[channel][step] = {
-            'active': active,
-            'note': note,
-            'velocity': velocity
-        }
+        with self._lock:
+            self.step_active[channel][step] = bool(active)
+            self.step_note[channel][step] = NO_NOTE if note is None else note
+            self.step_velocity[channel][step] = velocity
+            self._pattern_version += 1
 
-    def get_step(self, channel: int, step: int) -> dict:
+    def get_step(self, channel: int, step: int) -> StepView:
         """Get parameters for a specific step in a channel's pattern"""
         if not (0 <= channel <= 15):
             raise ValueError("Channel must be between 0 and 15")
         if not (0 <= step < self.max_steps):
             raise ValueError(f"Step must be between 0 and {self.max_steps - 1}")
 
-        return self.patterns[channel][step].copy()
+        with self._lock:
+            active = self.step_active[channel][step]
+            note = self.step_note[channel][step]
+            velocity = self.step_velocity[channel][step]
+        return StepView(bool(active), None if note == NO_NOTE else note, velocity)
 
     def clear_channel(self, channel: int):
         """Clear all steps in a channel's pattern"""
         if not (0 <= channel <= 15):
             raise ValueError("Channel must be between 0 and 15")
 
-        self.patterns[channel] = {
-            step: {
-                'active': False,
-                'note': None,
-                'velocity': 100
-            } for step in range(self.max_steps)
-        }
+        with self._lock:
+            self._clear_channel_rows(channel)
+
+    def _clear_channel_rows(self, channel: int):
+        """Reset a channel's rows to empty steps; the caller holds _lock"""
+        self.step_active[channel][:] = self._empty_active
+        self.step_note[channel][:] = self._empty_note
+        self.step_velocity[channel][:] = self._empty_velocity
+        self._pattern_version += 1
 
     # Modify set_channel_steps to ensure proper length setting:
     def set_channel_steps(self, channel: int, steps: int):
@@ -80,39 +111,32 @@ class StepSequencer:
         if not (1 <= steps <= self.max_steps):
             raise ValueError(f"Steps must be between 1 and {self.max_steps}")
 
-        self.channel_lengths[channel] = steps
-
-        # Preserve existing steps up to new length, clear the rest
-        current_pattern = self.patterns[channel]
-        new_pattern = {}
-
-        for step in range(self.max_steps):
-            if step < steps:
-                new_pattern[step] = current_pattern[step] if step in current_pattern else {
-                    'active': False,
-                    'note': None,
-                    'velocity': 100
-                }
-            else:
-                new_pattern[step] = {
-                    'active': False,
-                    'note': None,
-                    'velocity': 100
-                }
+        with self._lock:
+            self.channel_lengths[channel] = steps
 
-        self.patterns[channel] = new_pattern
+            # Preserve existing steps up to new length, clear the rest
+            self.step_active[channel][steps:] = self._empty_active[steps:]
+            self.step_note[channel][steps:] = self._empty_note[steps:]
+            self.step_velocity[channel][steps:] = self._empty_velocity[steps:]
+            self._pattern_version += 1
 
     def play_step(self, step: int):
         """Play all active notes for the current step across all channels"""
-        for channel in range(16):
-            step_data = self.patterns[channel][step]
-            if step_data['active'] and step_data['note'] is not None:
-                self.midi_device.send_note(
-                    step_data['note'],
-                    self.step_time * 0.9,  # Slightly shorter than step time to prevent notes bleeding
-                    channel,
-                    step_data['velocity']
-                )
+        # Snapshot the step's notes under the lock, then send without it
+        with self._lock:
+            version = self._pattern_version
+            cached_version, channels = self._active_channels[step]
+            if cached_version != version:
+                channels = tuple(channel for channel in range(16)
+                                 if self.step_active[channel][step]
+                                 and self.step_note[channel][step] != NO_NOTE)
+                self._active_channels[step] = (version, channels)
+            notes = [(channel, self.step_note[channel][step], self.step_velocity[channel][step])
+                     for channel in channels]
+
+        duration = self.step_time * 0.9  # Slightly shorter than step time to prevent notes bleeding
+        for channel, note, velocity in notes:
+            self.midi_device.send_note(note, duration, channel, velocity)
 
     def start(self):
         """Start the sequencer"""
@@ -129,13 +153,21 @@ class StepSequencer:
 
     def _run(self):
         """Main sequencer loop"""
+        # Steps fall on a grid of absolute deadlines, so a late wakeup doesn't
+        # delay every step after it
+        next_deadline = time.monotonic_ns()
         while self.running:
-            start_time = time.time()
             self.play_step(self.playback_step)
 
-            elapsed = time.time() - start_time
-            sleep_time = max(0, self.step_time - elapsed)
-            time.sleep(sleep_time)
+            # Read step_time each step so set_bpm takes effect on the next one
+            step_ns = int(self.step_time * 1e9)
+            next_deadline += step_ns
+            delay = next_deadline - time.monotonic_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            elif -delay > step_ns:
+                # More than a step behind: restart the grid instead of bursting
+                next_deadline = time.monotonic_ns()
 
             # Use the current channel's length for playback
             current_length = self.channel_lengths[0]  # Default to first channel
@@ -153,35 +185,58 @@ class StepSequencer:
         if not (0 <= source_channel <= 15 and 0 <= target_channel <= 15):
             raise ValueError("Channels must be between 0 and 15")
 
-        self.patterns[target_channel] = {
-            step: self.patterns[source_channel][step].copy()
-            for step in range(self.max_steps)
-        }
+        with self._lock:
+            self.step_active[target_channel][:] = self.step_active[source_channel]
+            self.step_note[target_channel][:] = self.step_note[source_channel]
+            self.step_velocity[target_channel][:] = self.step_velocity[source_channel]
+            self._pattern_version += 1
 
     def play_random_scale(self, note_chance=0.5, octave_chance=0.5, channel=0):
         """Continuously play random notes from the current scale"""
         while self.scale_playback and self.current_scale:
-            rand_value = random.random()  # Generate value between 0.0 and 1.0
-            if rand_value <= note_chance:  # Note will only play if random value is less than or equal to chance
-                octave_rand = random.random()  # Separate random value for octave
-                if octave_rand <= octave_chance:
-                    possible_octaves = list(self.current_scale.keys())
-                    self.current_octave = random.choice(possible_octaves)
-
-                if self.current_octave in self.current_scale:
-                    note = random.choice(self.current_scale[self.current_octave])
-                    self.midi_device.send_note(
-                        note,
-                        self.step_time * 0.9,
-                        channel=self.midi_device.channel, # Use the current active channe
-                        velocity=random.randint(70, 100)
-                    )
+            picked = self._pick_scale_note(note_chance, octave_chance)
+            if picked is not None:
+                note, velocity = picked
+                self.midi_device.send_note(
+                    note,
+                    self.step_time * 0.9,
+                    channel=self.midi_device.channel, # Use the current active channe
+                    velocity=velocity
+                )
 
             time.sleep(self.step_time)
 
+    def _pick_scale_note(self, note_chance, octave_chance):
+        """Roll one step of random scale playback: (note, velocity), or None for a rest"""
+        # Direct random() calls scaled to indexes, skipping choice()/randint()
+        rand = random.random
+        if rand() > note_chance:  # Note will only play if random value is less than or equal to chance
+            return None
+        if rand() <= octave_chance:  # Separate random value for octave
+            octaves = self._scale_octaves
+            self.current_octave = octaves[int(rand() * len(octaves))]
+
+        octave_notes = self._scale_notes.get(self.current_octave)
+        if not octave_notes:
+            return None
+        return octave_notes[int(rand() * len(octave_notes))], 70 + int(rand() * 31)  # velocity 70-100
+
+    def _scale_layout(self, scale_dict):
+        """Sorted octaves and {octave: notes tuple} of a scale, reused for the same scale object"""
+        if scale_dict is self._last_scale:
+            return self._last_scale_layout
+
+        octaves = tuple(sorted(octave for octave, notes in scale_dict.items() if notes))
+        if not octaves:
+            raise ValueError("Scale has no notes in the selected octave range")
+        layout = (octaves, {octave: tuple(scale_dict[octave]) for octave in octaves})
+        self._last_scale, self._last_scale_layout = scale_dict, layout
+        return layout
+
     def start_scale_playback(self, scale_dict, note_chance=0.5, octave_chance=0.5,channel=0):
+        self._scale_octaves, self._scale_notes = self._scale_layout(scale_dict)
         self.current_scale = scale_dict
-        self.current_octave = min(scale_dict.keys())
+        self.current_octave = self._scale_octaves[0]
         self.scale_playback = True
         self.scale_thread = threading.Thread(
             target=self.play_random_scale,
@@ -198,25 +253,38 @@ class StepSequencer:
 
     def apply_random_pattern_from_scale(self, channel: int, scale_dict: dict, note_chance=0.5, octave_chance=0.5):
         """Apply random notes from scale to pattern"""
-        pattern_length = self.channel_lengths[channel]
-        self.clear_channel(channel)
-
-        # Initialize with default octave
-        current_octave = min(scale_dict.keys())
-
-        for step in range(pattern_length):
-            # Check note chance
-            if random.random() <= note_chance:
-                # Check octave chance
-                if random.random() <= octave_chance:
-                    possible_octaves = list(scale_dict.keys())
-                    current_octave = random.choice(possible_octaves)
-
-                # Get notes from current octave
-                if current_octave in scale_dict:
-                    note = random.choice(scale_dict[current_octave])
-                    self.patterns[channel][step] = {
-                        'active': True,
-                        'note': note,
-                        'velocity': random.randint(80, 100)
-                    }
\ No newline at end of file
+        if not (0 <= channel <= 15):
+            raise ValueError("Channel must be between 0 and 15")
+        possible_octaves, scale_notes = self._scale_layout(scale_dict)
+
+        # The fill is one pattern edit: playback sees the old notes or the new ones
+        with self._lock:
+            pattern_length = self.channel_lengths[channel]
+            self._clear_channel_rows(channel)
+
+            active = self.step_active[channel]
+            notes = self.step_note[channel]
+            velocities = self.step_velocity[channel]
+
+            # Initialize with default octave
+            current_octave = possible_octaves[0]
+            octave_count = len(possible_octaves)
+
+            # Every draw below is a direct random() call scaled to an index, which
+            # skips the choice()/randint() call chains per step
+            rand = random.random
+            for step in range(pattern_length):
+                # Check note chance
+                if rand() <= note_chance:
+                    # Check octave chance
+                    if rand() <= octave_chance:
+                        current_octave = possible_octaves[int(rand() * octave_count)]
+
+                    # Get notes from current octave
+                    octave_notes = scale_notes.get(current_octave)
+                    if octave_notes:
+                        active[step] = 1
+                        notes[step] = octave_notes[int(rand() * len(octave_notes))]
+                        velocities[step] = 80 + int(rand() * 21)  # 80-100 inclusive
+
+            self._pattern_version += 1
\ No newline at end of file